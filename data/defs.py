@@ -1,4 +1,6 @@
 from datetime import timedelta
+from functools import lru_cache
+from typing import Tuple
 
 # ---------------------------------------------
 # CONSTANTS & GLOBALS
@@ -22,3 +24,25 @@ DEFAULT_SOURCES = {
         # {"url": "https://www.ft.com/", "selectors": {"headlines": ".js-teaser-heading-link"}}
     ]
 }
+
+
+# ---------------------------------------------
+# HELPERS
+# ---------------------------------------------
+@lru_cache(maxsize=32)
+def resolved_rss_urls(symbol: str, templates: Tuple[str, ...] = tuple(DEFAULT_SOURCES["rss"])) -> Tuple[str, ...]:
+    """
+    Resolve RSS URL templates for a symbol, memoized across fetcher runs.
+    
+    Args:
+        symbol: Yahoo-style symbol (e.g., 'GC=F')
+        templates: URL templates with {yahoo_symbol}/{google_symbol} fields
+        
+    Returns:
+        Tuple[str, ...]: Fully formatted feed URLs
+    """
+    google_symbol = SYMBOL_MAPPING.get(symbol, symbol.replace("=F", ""))
+    return tuple(
+        template.format(yahoo_symbol=symbol, google_symbol=google_symbol)
+        for template in templates
+    )
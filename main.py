@@ -1,5 +1,6 @@
-import time
-import threading
+import asyncio
+import signal
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
 from trademood.core.sentiment.fetcher import Fetcher
@@ -27,6 +28,10 @@ def main():
     )
     trading_generator = SignalGenerator(error_handler=error_handler, db_handler=db_handler)
     
+    # Scheduled runs share one event loop instead of a background thread
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    
     # Run pipeline once
     runner = Pipeline(
         fetcher=fetcher,
@@ -34,23 +39,35 @@ def main():
         trend_generator=trend_generator,
         trading_generator=trading_generator,
         error_handler=error_handler,
-        update_frequency="5m"
+        update_frequency="5m",
+        scheduler=AsyncIOScheduler(event_loop=loop)
     )
     runner.run_pipeline(symbol="GC=F")
     
+    def shutdown():
+        error_handler.log_info("Shutting down scheduler...")
+        runner.stop_scheduled_runs()
+        analyzer.close()
+        # Queued behind the scheduler's own shutdown callback
+        loop.call_soon(loop.stop)
+        
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, shutdown)
+        except NotImplementedError:
+            pass  # Windows: fall back to KeyboardInterrupt below
+    
     # Start scheduled runs
     try:
         runner.start_scheduled_runs()
-        print(threading.active_count())
-        error_handler.log_info("Scheduler started, keeping main process alive...")
-        # Keep the script running until interrupted
-        while True:
-            time.sleep(60)  # Check every minute
+        error_handler.log_info("Scheduler started, running event loop...")
+        loop.run_forever()
     except (KeyboardInterrupt, SystemExit):
-        error_handler.log_info("Shutting down scheduler...")
-        runner.stop_scheduled_runs()
+        shutdown()
+        loop.run_forever()
+    finally:
+        loop.close()
         error_handler.log_info("Scheduler shut down successfully.")
 
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
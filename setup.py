@@ -10,20 +10,20 @@ setup(
         'python-dateutil',
         'requests',
         'beautifulsoup4',
+        'lxml',
         'vader-sentiment',
         'transformers',
         'torch',
         'apscheduler',
         'fastapi',
         'uvicorn',
-        'streamlit',
+        'streamlit>=1.37',
         'yfinance',
         'plotly',
-        'streamlit-autorefresh',
         'exchange-calendars',
         'pytest',
     ],
-    python_requires='>=3.0',
+    python_requires='>=3.10',
     author='Abdel Dorgham',
     author_email='a.k.y.dorgham@gmail.com',
     description='A Streamlit-based dashboard for financial market sentiment analysis and trade management.',
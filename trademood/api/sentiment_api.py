@@ -1,9 +1,15 @@
+import json
 import sqlite3
+from typing import Iterator
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 import uvicorn
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
 
+# Rows pulled from SQLite per chunk when streaming a response
+STREAM_CHUNK_ROWS = 500
+
 class SentimentAPI:
     """
     A class used to provide REST API endpoints for accessing sentiment analysis results and trading signals.
@@ -58,66 +64,88 @@ class SentimentAPI:
         self._register_routes()
         
     def _register_routes(self) -> None:
-        """Register all API routes."""
+        """
+        Register all API routes.
+        
+        Routes are plain functions so FastAPI runs them in its threadpool; each
+        worker thread reads through its own DatabaseHandler connection, keeping
+        the event loop free while SQLite blocks.
+        """
         @self.app.get("/sentiment/latest")
-        async def get_latest_sentiment(limit: int = 10):
+        def get_latest_sentiment(limit: int = 10):
             """Get latest sentiment analysis results."""
             try:
-                with sqlite3.connect(self.db_handler.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                    SELECT source, text, timestamp, normalized_score 
-                    FROM sentiment_cache 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                    """, (limit,))
-                    
-                    results = []
-                    for row in cursor.fetchall():
-                        results.append({
-                            "source": row[0],
-                            "text": row[1],
-                            "timestamp": row[2],
-                            "score": row[3]
-                        })
-                        
-                    return {"results": results}
-                    
+                cursor = self.db_handler.connect().cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute("""
+                SELECT source, text, timestamp, normalized_score AS score
+                FROM sentiment_cache 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+                """, (limit,))
+                
+                return {"results": [dict(row) for row in cursor.fetchall()]}
+                
             except Exception as e:
                 self.error_handler.log_error(e, "API: getting latest sentiment")
                 return {"error": "Failed to fetch sentiment data"}, 500
                 
         @self.app.get("/signals/trend")
-        async def get_trend_signals(days: int = 7):
+        def get_trend_signals(days: int = 7):
             """Get trend signals over a time period."""
             try:
-                with sqlite3.connect(self.db_handler.db_path) as conn:
+                # The stream is drained across threadpool workers after this
+                # returns, so it gets its own connection rather than the
+                # calling thread's shared one
+                conn = sqlite3.connect(self.db_handler.db_path, check_same_thread=False)
+                try:
                     cursor = conn.cursor()
+                    cursor.row_factory = sqlite3.Row
                     cursor.execute("""
-                    SELECT timestamp, short_term_trend, medium_term_trend, 
-                           long_term_trend, trend_strength, change_direction
+                    SELECT timestamp, short_term_trend AS short_term, medium_term_trend AS medium_term,
+                           long_term_trend AS long_term, trend_strength AS strength,
+                           change_direction AS direction
                     FROM trend_signals
                     WHERE timestamp >= datetime('now', ? || ' days')
                     ORDER BY timestamp DESC
                     """, (f"-{days}",))
-                    
-                    results = []
-                    for row in cursor.fetchall():
-                        results.append({
-                            "timestamp": row[0],
-                            "short_term": row[1],
-                            "medium_term": row[2],
-                            "long_term": row[3],
-                            "strength": row[4],
-                            "direction": row[5]
-                        })
-                        
-                    return {"results": results}
-                    
+                except Exception:
+                    conn.close()
+                    raise
+                
+                return StreamingResponse(
+                    self._stream_results(conn, cursor),
+                    media_type="application/json"
+                )
+                
             except Exception as e:
                 self.error_handler.log_error(e, "API: getting trend signals")
                 return {"error": "Failed to fetch trend signals"}, 500
                 
+    def _stream_results(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> Iterator[str]:
+        """
+        Encode query rows as a {"results": [...]} JSON body, chunk by chunk.
+        
+        Args:
+            conn: Connection owned by the stream, closed once drained
+            cursor: Executed cursor producing sqlite3.Row objects
+            
+        Returns:
+            Iterator[str]: Pieces of the JSON document
+        """
+        try:
+            yield '{"results": ['
+            separator = ""
+            while True:
+                rows = cursor.fetchmany(STREAM_CHUNK_ROWS)
+                if not rows:
+                    break
+                yield separator + ", ".join(json.dumps(dict(row)) for row in rows)
+                separator = ", "
+            yield "]}"
+        finally:
+            conn.close()
+            
     def run(self, host: str = "0.0.0.0", port: int = 8000) -> None:
         """
         Run the API server.
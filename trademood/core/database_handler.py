@@ -1,9 +1,69 @@
+import functools
+import json
 import sqlite3
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from hashlib import blake2b
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.models.sentiment_result import SentimentResult
-from data.defs import DEFAULT_DB_PATH
+from data.defs import DEFAULT_DB_PATH, DEFAULT_CACHE_TTL
+
+# Same layout SQLite's datetime() produces, so stored values compare as strings
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def text_fingerprint(text: str) -> int:
+    """
+    Hash text to a signed 64-bit integer that fits an SQLite INTEGER column.
+    
+    Args:
+        text: Text content to fingerprint
+        
+    Returns:
+        int: Stable 64-bit fingerprint
+    """
+    return int.from_bytes(blake2b(text.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+def _close_connections(connections: List[sqlite3.Connection], lock: threading.Lock,
+                       error_handler: ErrorHandler) -> None:
+    """
+    Close and forget every connection in a handler's shared list.
+    
+    Args:
+        connections: The handler's list of opened connections, emptied in place
+        lock: Lock guarding the list
+        error_handler: ErrorHandler for logging close failures
+    """
+    with lock:
+        closing = connections[:]
+        connections.clear()
+    for conn in closing:
+        try:
+            conn.close()
+        except Exception as e:
+            error_handler.log_error(e, "closing database connection")
+
+# Distinct (source, text) probes remembered in-process between writes
+PROBE_CACHE_SIZE = 4096
+
+# Seconds between checks for sentiment cache writes made outside the handler
+EXTERNAL_WRITE_CHECK_INTERVAL = 1.0
+
+# Fingerprints per bulk lookup query, well under SQLite's variable limit
+BULK_PROBE_CHUNK = 400
+
+# Applied once to every connection the handler opens. NORMAL sync is safe under WAL.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
 
 class DatabaseHandler:
     """
@@ -26,11 +86,13 @@ class DatabaseHandler:
     Methods
     -------
     connect()
-        Establishes a connection to the SQLite database.
+        Returns the calling thread's tuned, long-lived SQLite connection.
     create_tables()
         Creates necessary tables in the database if they do not already exist.
     insert_sentiment_result(sentiment_result)
         Inserts a `SentimentResult` object into the database.
+    cache_sentiment_results(results)
+        Inserts a batch of `SentimentResult` objects in one transaction.
     get_sentiment_results(symbol, start_time, end_time)
         Retrieves sentiment results for a specific symbol within a given time range.
     insert_trend_signal(trend_signal)
@@ -41,8 +103,18 @@ class DatabaseHandler:
         Inserts a `TradingSignal` object into the database.
     get_trading_signals(symbol, start_time, end_time)
         Retrieves trading signals for a specific symbol within a given time range.
+    get_cached_sentiment(source, text)
+        Looks up a cached result, answering repeat probes from memory.
+    get_cached_sentiments_bulk(pairs)
+        Looks up cached results for many (source, text) pairs in one query.
+    get_sentiment_arrays(symbol)
+        Returns a symbol's cached timestamps and normalized scores as NumPy arrays.
+    clear_sentiment_cache(symbol)
+        Deletes every cached sentiment result for a symbol.
+    remove_expired()
+        Deletes all cached sentiment results whose TTL has elapsed.
     close_connection()
-        Closes the connection to the database.
+        Closes every connection opened by the handler.
     """
 
     
@@ -56,30 +128,147 @@ class DatabaseHandler:
         """
         self.db_path = db_path
         self.error_handler = error_handler or ErrorHandler()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # Every write goes through one connection, so its data_version moves
+        # only for commits made outside this handler
+        self._writer = None
+        self._write_lock = threading.RLock()
+        self._data_version = None
+        self._cache_extent = None
+        self._last_external_check = float('-inf')
+        self._known_keys = None
+        self._probe_cache = functools.lru_cache(maxsize=PROBE_CACHE_SIZE)(self._probe_sentiment)
+        # Closes the connections at exit or when the handler is collected, without
+        # keeping the handler alive until then; holds only the shared list and lock
+        weakref.finalize(self, _close_connections, self._connections, self._connections_lock, self.error_handler)
         self._initialize_database()
+        self._known_keys = self._load_known_keys()
+        
+    def connect(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening and tuning it on first use.
+        
+        Connections run in autocommit mode; writes group their statements with
+        `_transaction` so each batch costs a single commit.
+        
+        Returns:
+            sqlite3.Connection: Connection owned by the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+        return conn
+        
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned autocommit connection and register it for closing."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+        
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run the enclosed statements in one explicit transaction on the writer connection.
+        
+        IMMEDIATE takes SQLite's write lock up front, so no other connection can
+        commit between the external-write check and this transaction's own
+        statements; the cache extent recorded before COMMIT is then exactly
+        what this handler knows about.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_connection()
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._absorb_external_writes(conn)
+                yield conn
+                self._cache_extent = self._read_cache_extent(conn)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        
+    def close_connection(self) -> None:
+        """Close every connection opened by this handler."""
+        with self._write_lock, self._connections_lock:
+            self._local = threading.local()
+            self._writer = None
+            self._data_version = None
+        _close_connections(self._connections, self._connections_lock, self.error_handler)
         
     def _initialize_database(self) -> None:
         """Create necessary tables if they don't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 
-                # Create sentiment cache table
+                # Caches from before text fingerprints are rebuilt below
+                columns = {row[1] for row in cursor.execute("PRAGMA table_info(sentiment_cache)")}
+                legacy = bool(columns) and "text_hash" not in columns
+                if legacy:
+                    for index in ("idx_sentiment_expires", "idx_cache_source_text", "idx_cache_symbol_ts"):
+                        cursor.execute(f"DROP INDEX IF EXISTS {index}")
+                    cursor.execute("ALTER TABLE sentiment_cache RENAME TO sentiment_cache_legacy")
+                
+                # Create sentiment cache table; uniqueness is keyed on a 64-bit text
+                # fingerprint so the index stores an integer instead of the headline
                 cursor.execute("""
                 CREATE TABLE IF NOT EXISTS sentiment_cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     symbol TEXT NOT NULL, 
                     source TEXT NOT NULL,
                     text TEXT NOT NULL,
+                    text_hash INTEGER NOT NULL,
                     timestamp DATETIME NOT NULL,
                     vader_score REAL NOT NULL,
                     bert_score REAL NOT NULL,
                     normalized_score REAL NOT NULL,
                     keywords TEXT NOT NULL,
-                    UNIQUE(symbol, source, text)
+                    expires_at DATETIME NOT NULL
                 )
                 """)
                 
+                if legacy:
+                    conn.create_function("text_hash", 1, text_fingerprint, deterministic=True)
+                    ttl = f"+{int(DEFAULT_CACHE_TTL.total_seconds())} seconds"
+                    # Caches created before expiry tracking have no expires_at either
+                    expires_at = "expires_at" if "expires_at" in columns else "NULL"
+                    cursor.execute(f"""
+                    INSERT OR IGNORE INTO sentiment_cache
+                    (symbol, source, text, text_hash, timestamp, vader_score, bert_score,
+                     normalized_score, keywords, expires_at)
+                    SELECT symbol, source, text, text_hash(text), timestamp, vader_score, bert_score,
+                           normalized_score, keywords, COALESCE({expires_at}, datetime(timestamp, ?))
+                    FROM sentiment_cache_legacy
+                    """, (ttl,))
+                    cursor.execute("DROP TABLE sentiment_cache_legacy")
+                
+                cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_cache_hash
+                ON sentiment_cache(symbol, source, text_hash)
+                """)
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sentiment_expires
+                ON sentiment_cache(expires_at)
+                """)
+
+                # Cache probes filter on (source, text_hash); API queries on symbol, newest first
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_source_hash
+                ON sentiment_cache(source, text_hash)
+                """)
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_symbol_ts
+                ON sentiment_cache(symbol, timestamp DESC)
+                """)
+
                 # Create trend signals table
                 cursor.execute("""
                 CREATE TABLE IF NOT EXISTS trend_signals (
@@ -106,7 +295,15 @@ class DatabaseHandler:
                 )
                 """)
                 
-                conn.commit()
+                # Dashboard reads: latest signal per symbol, trends in time order
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trading_symbol_ts
+                ON trading_signals(symbol, timestamp DESC)
+                """)
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trend_ts
+                ON trend_signals(timestamp)
+                """)
                 
         except Exception as e:
             self.error_handler.log_error(e, "initializing database", raise_exception=True)
@@ -121,36 +318,71 @@ class DatabaseHandler:
         Returns:
             bool: True if successful, False otherwise
         """
+        return self.cache_sentiment_results([result])
+        
+    def cache_sentiment_results(self, results: List[SentimentResult]) -> bool:
+        """
+        Cache a batch of sentiment results in a single transaction.
+        
+        Headlines already cached are left untouched, so feeds that repeat
+        items every tick cost no page or index writes.
+        
+        Args:
+            results: SentimentResults to cache
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not results:
+            return True
+            
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                INSERT OR REPLACE INTO sentiment_cache 
-                (symbol, source, text, timestamp, vader_score, bert_score, normalized_score, keywords)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+            hashes = [text_fingerprint(result.text) for result in results]
+            with self._transaction() as conn:
+                known_keys = self._known_keys
+                keys = list(zip((result.source for result in results), hashes))
+                unseen = len(keys) if known_keys is None else sum(key not in known_keys for key in keys)
+                cursor = conn.executemany("""
+                INSERT INTO sentiment_cache 
+                (symbol, source, text, text_hash, timestamp, vader_score, bert_score, normalized_score, keywords, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(symbol, source, text_hash) DO NOTHING
+                """, [(
                     result.symbol, 
                     result.source,
                     result.text,
+                    text_hash,
                     result.timestamp.isoformat(),
                     result.vader_score,
                     result.bert_score,
                     result.normalized_score,
-                    ",".join(result.keywords)
-                ))
+                    json.dumps(result.keywords),
+                    self._to_utc_string(result.timestamp + DEFAULT_CACHE_TTL)
+                ) for result, text_hash in zip(results, hashes)])
                 
-                conn.commit()
-                return True
+            if known_keys is not None:
+                known_keys.update(keys)
+            # Keys never cached were rejected before reaching the LRU, so rows
+            # under them cannot contradict a remembered probe. More inserts than
+            # unseen keys means a known key gained a row, e.g. for another symbol.
+            if known_keys is None or cursor.rowcount > unseen:
+                self._probe_cache.cache_clear()
+            return True
                 
         except Exception as e:
-            self.error_handler.log_error(e, "caching sentiment result")
+            self.error_handler.log_error(e, "caching sentiment results")
             return False
                
     def get_cached_sentiment(self, source: str, text: str) -> Optional[SentimentResult]:
         """
         Retrieve a cached sentiment result.
         
+        Texts never cached are rejected from an in-memory key set without
+        touching SQLite; repeat probes are answered from an in-process LRU.
+        Sentiment cache writes made outside this handler, such as by another
+        process, invalidate both within `EXTERNAL_WRITE_CHECK_INTERVAL`
+        seconds. Results past their TTL are never returned.
+        
         Args:
             source: Source identifier
             text: Original text content
@@ -159,29 +391,258 @@ class DatabaseHandler:
             Optional[SentimentResult]: Cached result if found, None otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                SELECT symbol, source, text, timestamp, vader_score, bert_score, normalized_score, keywords
-                FROM sentiment_cache
-                WHERE source = ? AND text = ?
-                """, (source, text))
-                
-                row = cursor.fetchone()
-                if row:
-                    return SentimentResult(
-                        symbol=row[0],
-                        text=row[2],
-                        source=row[1],
-                        timestamp=datetime.fromisoformat(row[3]),
-                        vader_score=row[4],
-                        bert_score=row[5],
-                        normalized_score=row[6],
-                        keywords=row[7].split(",") if row[7] else []
-                    )
+            self._sync_external_writes()
+            known_keys = self._known_keys
+            if known_keys is not None and (source, text_fingerprint(text)) not in known_keys:
                 return None
-                
+            # Remembered rows can pass their TTL while they sit in the LRU
+            cached = self._probe_cache(source, text)
+            if cached is None or cached[1] < self._to_utc_string(datetime.now(timezone.utc)):
+                return None
+            return cached[0]
+            
         except Exception as e:
             self.error_handler.log_error(e, "retrieving cached sentiment")
             return None
+            
+    def _sync_external_writes(self) -> None:
+        """Refresh in-memory cache state if sentiment_cache changed outside this handler."""
+        now = time.monotonic()
+        if now - self._last_external_check < EXTERNAL_WRITE_CHECK_INTERVAL:
+            return
+        # A write in progress checks for itself once it holds the lock
+        if not self._write_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_external_check = now
+            if self._writer is None:
+                self._writer = self._open_connection()
+            self._absorb_external_writes(self._writer)
+        finally:
+            self._write_lock.release()
+            
+    def _absorb_external_writes(self, conn: sqlite3.Connection) -> None:
+        """
+        Reconcile in-memory cache state with commits made outside this handler.
+        
+        `PRAGMA data_version` on the writer connection changes only for commits
+        made through other connections. Those include trade and price writes,
+        so the sentiment_cache extent decides what actually changed: remembered
+        probes are dropped on any change, and the known-key set is reloaded only
+        when rows were added, since keys of deleted rows merely cost a probe.
+        Must be called with the write lock held.
+        
+        Args:
+            conn: The handler's writer connection
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        previous = self._cache_extent
+        if previous is None:
+            return
+        extent = self._read_cache_extent(conn)
+        if extent == previous:
+            return
+        self._cache_extent = extent
+        if extent[0] != previous[0]:
+            self._known_keys = self._load_known_keys()
+        self._probe_cache.cache_clear()
+        
+    @staticmethod
+    def _read_cache_extent(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Return sentiment_cache's highest row id and row count."""
+        max_id, count = conn.execute("SELECT MAX(id), COUNT(*) FROM sentiment_cache").fetchone()
+        return max_id or 0, count
+            
+            
+    def _probe_sentiment(self, source: str, text: str) -> Optional[Tuple[SentimentResult, str]]:
+        """Look up an unexpired cached sentiment result and its expiry in SQLite, raising on failure."""
+        cursor = self.connect().cursor()
+        
+        cursor.execute("""
+        SELECT symbol, source, text, timestamp, vader_score, bert_score, normalized_score, keywords, expires_at
+        FROM sentiment_cache
+        WHERE source = ? AND text_hash = ? AND text = ? AND expires_at >= ?
+        """, (source, text_fingerprint(text), text, self._to_utc_string(datetime.now(timezone.utc))))
+        
+        row = cursor.fetchone()
+        return (self._row_to_result(row), row[8]) if row else None
+        
+    def get_cached_sentiments_bulk(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], SentimentResult]:
+        """
+        Retrieve unexpired cached sentiment results for many (source, text) pairs at once.
+        
+        Args:
+            pairs: (source, text) pairs to look up
+            
+        Returns:
+            Dict[Tuple[str, str], SentimentResult]: Cached results keyed by
+                (source, text); pairs without a cached result are absent
+        """
+        try:
+            self._sync_external_writes()
+        except Exception as e:
+            self.error_handler.log_error(e, "checking for external cache writes")
+        known_keys = self._known_keys
+        # source -> text_hash -> requested texts; one indexed query per source
+        wanted: Dict[str, Dict[int, List[str]]] = {}
+        for source, text in pairs:
+            text_hash = text_fingerprint(text)
+            if known_keys is None or (source, text_hash) in known_keys:
+                wanted.setdefault(source, {}).setdefault(text_hash, []).append(text)
+                
+        found = {}
+        try:
+            cursor = self.connect().cursor()
+            now = self._to_utc_string(datetime.now(timezone.utc))
+            for source, texts_by_hash in wanted.items():
+                hashes = list(texts_by_hash)
+                for start in range(0, len(hashes), BULK_PROBE_CHUNK):
+                    chunk = hashes[start:start + BULK_PROBE_CHUNK]
+                    cursor.execute(f"""
+                    SELECT symbol, source, text, timestamp, vader_score, bert_score, normalized_score, keywords, text_hash
+                    FROM sentiment_cache
+                    WHERE source = ? AND expires_at >= ? AND text_hash IN ({", ".join("?" * len(chunk))})
+                    """, [source, now, *chunk])
+                    for row in cursor.fetchall():
+                        # Texts sharing a fingerprint must still match exactly
+                        if (source, row[2]) not in found and row[2] in texts_by_hash[row[8]]:
+                            found[(source, row[2])] = self._row_to_result(row)
+            return found
+            
+        except Exception as e:
+            self.error_handler.log_error(e, "retrieving cached sentiments in bulk")
+            return found
+
+    def get_sentiment_arrays(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieve a symbol's cached sentiment history as columnar arrays.
+        
+        Timestamps are converted to UTC; naive timestamps are taken as UTC.
+        
+        Args:
+            symbol: Financial instrument symbol
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: datetime64[ns] timestamps and float64
+                normalized scores, empty if nothing is cached or the query fails
+        """
+        try:
+            rows = self.connect().execute(
+                "SELECT timestamp, normalized_score FROM sentiment_cache WHERE symbol = ?", (symbol,)
+            ).fetchall()
+            if not rows:
+                return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.float64)
+                
+            timestamps, scores = zip(*rows)
+            index = pd.to_datetime(timestamps, utc=True, format='ISO8601').tz_convert(None)
+            return index.to_numpy(dtype='datetime64[ns]'), np.asarray(scores, dtype=np.float64)
+            
+        except Exception as e:
+            self.error_handler.log_error(e, f"retrieving sentiment arrays for {symbol}")
+            return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.float64)
+
+    def clear_sentiment_cache(self, symbol: str) -> int:
+        """
+        Delete every cached sentiment result for a symbol.
+        
+        Args:
+            symbol: Financial instrument symbol
+            
+        Returns:
+            int: Number of rows removed
+        """
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute("DELETE FROM sentiment_cache WHERE symbol = ?", (symbol,))
+            self._known_keys = self._load_known_keys()
+            self._probe_cache.cache_clear()
+            return cursor.rowcount
+            
+        except Exception as e:
+            self.error_handler.log_error(e, f"clearing sentiment cache for {symbol}")
+            return 0
+
+    def remove_expired(self) -> int:
+        """
+        Delete every cached sentiment result whose TTL has elapsed.
+        
+        Returns:
+            int: Number of rows removed
+        """
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM sentiment_cache WHERE expires_at < ?",
+                    (self._to_utc_string(datetime.now(timezone.utc)),)
+                )
+            # Remembered probes check expiry themselves, so the LRU stays valid
+            if cursor.rowcount:
+                self._known_keys = self._load_known_keys()
+            return cursor.rowcount
+            
+        except Exception as e:
+            self.error_handler.log_error(e, "removing expired sentiment results")
+            return 0
+            
+    def _load_known_keys(self) -> Optional[Set[Tuple[str, int]]]:
+        """
+        Load the (source, text_hash) key of every cached row.
+        
+        Returns:
+            Optional[Set[Tuple[str, int]]]: Cached keys, or None if they could
+                not be read, in which case every probe goes to SQLite
+        """
+        try:
+            return set(self.connect().execute("SELECT source, text_hash FROM sentiment_cache"))
+        except Exception as e:
+            self.error_handler.log_error(e, "loading cached sentiment keys")
+            return None
+            
+    @classmethod
+    def _row_to_result(cls, row: Tuple) -> SentimentResult:
+        """Build a SentimentResult from a sentiment_cache SELECT row."""
+        return SentimentResult(
+            symbol=row[0],
+            text=row[2],
+            source=row[1],
+            timestamp=datetime.fromisoformat(row[3]),
+            vader_score=row[4],
+            bert_score=row[5],
+            normalized_score=row[6],
+            keywords=cls._decode_keywords(row[7])
+        )
+            
+    @staticmethod
+    def _decode_keywords(value: Optional[str]) -> List[str]:
+        """
+        Decode a stored keywords column.
+        
+        Args:
+            value: JSON array, or a comma-joined string written by older versions
+            
+        Returns:
+            List[str]: Decoded keywords
+        """
+        if not value:
+            return []
+        if value.startswith("["):
+            return json.loads(value)
+        return value.split(",")
+            
+    @staticmethod
+    def _to_utc_string(timestamp: datetime) -> str:
+        """
+        Format a timestamp as a naive UTC string comparable with SQLite datetime().
+        
+        Args:
+            timestamp: Timezone-aware or naive (assumed UTC) datetime
+            
+        Returns:
+            str: Timestamp formatted as 'YYYY-MM-DD HH:MM:SS'
+        """
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.strftime(SQLITE_DATETIME_FORMAT)
@@ -21,13 +21,15 @@ class ErrorHandler:
     
         Logs an error message with context and optionally re-raises the exception.
    
-    log_warning(message: str, context: str) -> None
+    log_warning(message: str, *args, context: str) -> None
     
-        Logs a warning message with optional context information.
+        Logs a warning message with optional context information, formatting
+        any %-style arguments only when the warning is emitted.
     
-    log_info(message: str, context: str) -> None
+    log_info(message: str, *args, context: str) -> None
     
-        Logs an informational message with optional context.
+        Logs an informational message with optional context, formatting any
+        %-style arguments only when the message is emitted.
     """
     
     def __init__(self, name: str = "sentiment_analysis"):
@@ -54,6 +56,10 @@ class ErrorHandler:
         """
         Log an error with context and optionally raise it.
         
+        The traceback is only captured when the error is re-raised or DEBUG
+        logging is enabled, keeping repeated failures (e.g. a feed that is
+        down every tick) cheap to log.
+        
         Args:
             error: Exception to log
             context: Additional context about where the error occurred
@@ -62,26 +68,33 @@ class ErrorHandler:
         Raises:
             The original error if raise_exception is True
         """
-        self.logger.error(f"Error in {context}: {str(error)}", exc_info=True)
+        if self.logger.isEnabledFor(logging.ERROR):
+            with_traceback = raise_exception or self.logger.isEnabledFor(logging.DEBUG)
+            self.logger.error("Error in %s: %s", context, error,
+                              exc_info=error if with_traceback else None)
         if raise_exception:
             raise error
             
-    def log_warning(self, message: str, context: str = "") -> None:
+    def log_warning(self, message: str, *args, context: str = "") -> None:
         """
         Log a warning message with context.
         
         Args:
-            message: Warning message
+            message: Warning message, optionally with %-style placeholders
+            *args: Values for the placeholders, only formatted if the warning is emitted
             context: Additional context about the warning
         """
-        self.logger.warning(f"Warning in {context}: {message}")
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning("Warning in %s: %s", context, message % args if args else message)
         
-    def log_info(self, message: str, context: str = "") -> None:
+    def log_info(self, message: str, *args, context: str = "") -> None:
         """
         Log an informational message with context.
         
         Args:
-            message: Info message
+            message: Info message, optionally with %-style placeholders
+            *args: Values for the placeholders, only formatted if the message is emitted
             context: Additional context about the information
         """
-        self.logger.info(f"Info in {context}: {message}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Info in %s: %s", context, message % args if args else message)
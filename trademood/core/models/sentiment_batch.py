@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import List
+import numpy as np
+import pandas as pd
+from trademood.core.models.sentiment_result import SentimentResult
+
+# Compared and hashed by identity: a DataFrame field supports neither
+@dataclass(slots=True, frozen=True, eq=False)
+class SentimentBatch:
+    """
+    A class used to hold many sentiment results column-wise for vectorized processing.
+
+    Where `SentimentResult` describes a single analyzed text, this dataclass stores
+    a whole pipeline tick as one DataFrame with a column per field, so trend
+    computations operate on contiguous score and timestamp arrays instead of
+    reading attributes row by row.
+
+    Attributes
+    ----------
+    frame : pd.DataFrame
+        One row per result with the columns of `SentimentResult`; `timestamp`
+        is a naive UTC datetime64 column and the score columns are float64.
+
+    Methods
+    -------
+    from_results(results)
+        Builds a batch from a list of `SentimentResult` objects.
+    to_results()
+        Converts the batch back into a list of `SentimentResult` objects.
+    timestamps()
+        Returns the timestamp column as a numpy datetime64 array.
+    scores()
+        Returns the normalized score column as a numpy float array.
+    """
+    frame: pd.DataFrame
+
+    COLUMNS = ('symbol', 'text', 'source', 'timestamp', 'vader_score',
+               'bert_score', 'normalized_score', 'keywords')
+
+    @classmethod
+    def from_results(cls, results: List[SentimentResult]) -> "SentimentBatch":
+        """
+        Build a batch from individual sentiment results.
+
+        Args:
+            results: Sentiment results to gather
+
+        Returns:
+            SentimentBatch: Column-wise view of the results
+        """
+        columns = {name: [getattr(result, name) for result in results] for name in cls.COLUMNS}
+        frame = pd.DataFrame(columns, columns=list(cls.COLUMNS))
+        # Feeds mix UTC offsets and naive values; normalize everything to naive UTC
+        frame['timestamp'] = pd.to_datetime(
+            frame['timestamp'], utc=True, format='ISO8601', cache=True
+        ).dt.tz_convert(None)
+        return cls(frame=frame)
+
+    def to_results(self) -> List[SentimentResult]:
+        """
+        Convert the batch back into individual sentiment results.
+
+        Returns:
+            List[SentimentResult]: One result per row, in row order
+        """
+        return [
+            SentimentResult(
+                symbol=row.symbol,
+                text=row.text,
+                source=row.source,
+                timestamp=row.timestamp.to_pydatetime(),
+                vader_score=row.vader_score,
+                bert_score=row.bert_score,
+                normalized_score=row.normalized_score,
+                keywords=row.keywords
+            ) for row in self.frame.itertuples(index=False)
+        ]
+
+    def timestamps(self) -> np.ndarray:
+        """Return the timestamp column as a datetime64 array."""
+        return self.frame['timestamp'].to_numpy()
+
+    def scores(self) -> np.ndarray:
+        """Return the normalized score column as a float array."""
+        return self.frame['normalized_score'].to_numpy(dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.frame)
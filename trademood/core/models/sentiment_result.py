@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import List
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SentimentResult:
     """
     A class used to represent the outcome of a sentiment analysis on a piece of text.
@@ -1,7 +1,7 @@
 from datetime import datetime
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingSignal:
     """
     A class used to represent a generated trading signal.
@@ -1,7 +1,7 @@
 from datetime import datetime
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrendSignal:
     """
     A class used to represent computed trend signals based on sentiment time series data.
@@ -1,11 +1,40 @@
+import multiprocessing
+import os
 import re
+import string
+import weakref
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Union
+import numpy as np
+import torch
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from transformers import pipeline
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
 from trademood.core.models.sentiment_result import SentimentResult
+from trademood.core.sentiment.vader_worker import vader_compound
+
+# URLs, @handles and '#' marks, stripped in one scan of every headline scored
+_STRIP_RE = re.compile(r'http\S+|www\S+|@\w+|#')
+
+# VADER holds no per-call state, so one lexicon load serves every Analyzer
+_VADER = SentimentIntensityAnalyzer()
+
+# Punctuation dropped before keyword counting so "gold." and "gold" merge
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+BERT_MODEL = "finiteautomata/bertweet-base-sentiment-analysis"
+
+# Distinct texts above which VADER fans out to worker processes
+VADER_POOL_THRESHOLD = 64
+
+# |VADER compound| above which a text is confidently polarized and BERT is skipped
+VADER_CONFIDENT_SCORE = 0.7
+
+# Texts per forward pass; amortizes per-call overhead without large padding waste
+BERT_BATCH_SIZE = 32
 
 class Analyzer:
     """
@@ -33,63 +62,215 @@ class Analyzer:
     -------
     analyze_vader(text)
         Analyzes the sentiment of a given text using the VADER model.
+    analyze_vader_batch(texts)
+        Scores many texts with VADER, evaluating each distinct text once.
     analyze_bert(text)
         Analyzes the sentiment of a given text using the BERT-based model.
+    analyze_bert_batch(texts)
+        Scores many texts with the BERT-based model in batched forward passes.
     combine_scores(vader_score, bert_score)
         Combines and normalizes individual VADER and BERT scores into a single metric.
     analyze_sentiment(symbol, text, source, timestamp)
         Performs a full sentiment analysis on a piece of text and returns a `SentimentResult` object.
+    analyze_texts(items, symbol)
+        Analyzes many texts at once, batching the model calls over cache misses.
+    close()
+        Shuts down the VADER worker processes, if any were started.
     """
     
     def __init__(self, error_handler: ErrorHandler = None, 
-                 db_handler: DatabaseHandler = None):
+                 db_handler: DatabaseHandler = None,
+                 quantize: bool = True,
+                 backend: str = "torch"):
         """
         Initialize the sentiment analyzer with NLP models.
         
         Args:
             error_handler: ErrorHandler instance
             db_handler: DatabaseHandler instance
+            quantize: Reduce BERT precision for throughput: fp16 weights when
+                a GPU is available, dynamic int8 linear layers on CPU
+            backend: "torch", or "onnx" to run BERT through ONNX Runtime via the
+                optional `optimum[onnxruntime]` package (falls back to torch
+                when it is not installed)
         """
-        self.vader_analyzer = SentimentIntensityAnalyzer()
-        self.bert_pipeline = pipeline(
-            "sentiment-analysis",
-            model="finiteautomata/bertweet-base-sentiment-analysis"
-        )
+        self.vader_analyzer = _VADER
+        self._vader_pool: Optional[ProcessPoolExecutor] = None
+        self._vader_pool_finalizer: Optional[weakref.finalize] = None
         self.error_handler = error_handler or ErrorHandler()
         self.db_handler = db_handler or DatabaseHandler()    
+        
+        self.bert_pipeline = self._load_onnx_pipeline() if backend == "onnx" else None
+        if self.bert_pipeline is None:
+            # Place the model on the GPU at load time; fp16 weights are loaded
+            # directly rather than converted after a full-precision load
+            use_gpu = torch.cuda.is_available()
+            self.bert_pipeline = pipeline(
+                "sentiment-analysis",
+                model=BERT_MODEL,
+                device=0 if use_gpu else -1,
+                dtype=torch.float16 if use_gpu and quantize else torch.float32
+            )
+            if quantize and not use_gpu:
+                self._quantize_bert_model()
+            
+        # Batches bypass the pipeline wrapper: tokenizer and model are called
+        # directly and labels become signs through one lookup table
+        self._bert_tokenizer = self.bert_pipeline.tokenizer
+        self._bert_model = self.bert_pipeline.model
+        id2label = self._bert_model.config.id2label
+        self._bert_signs = np.array([
+            self._convert_bert_label_to_score({'label': id2label[i], 'score': 1.0})
+            for i in range(len(id2label))
+        ], dtype=np.float64)
          
-    def analyze_text(self, text: str, source: str, symbol: str, pub_date: Optional[datetime] = None) -> Optional[SentimentResult]:
-        """Analyze text content for sentiment using multiple techniques."""
-        # Check cache first
+    def analyze_text(self, text: str, source: str, symbol: str, pub_date: Optional[datetime] = None,
+                     cache_result: bool = True) -> Optional[SentimentResult]:
+        """
+        Analyze text content for sentiment using multiple techniques.
+        
+        Args:
+            text: Text content to analyze
+            source: Source identifier
+            symbol: Financial instrument symbol
+            pub_date: Publication time, defaults to now
+            cache_result: Whether to persist the result immediately; batch callers
+                pass False and flush with `cache_sentiment_results`
+            
+        Returns:
+            Optional[SentimentResult]: Analysis result if successful
+        """
+        # Repeat texts are answered by the handler's in-process LRU without touching SQLite
         cached = self.db_handler.get_cached_sentiment(source, text)
         if cached:
             return cached
+        # Already known to be a miss, so score directly rather than probing again in bulk
+        results = self._score_texts([(text, source, pub_date)], symbol, cache_results=cache_result)
+        return results[0]
+        
+    def analyze_texts(self, items: List[Tuple[str, str, Optional[datetime]]], symbol: str,
+                      cache_results: bool = False) -> List[SentimentResult]:
+        """
+        Analyze many texts, scoring every cache miss in shared model batches.
+        
+        Args:
+            items: (text, source, pub_date) tuples; pub_date may be None
+            symbol: Financial instrument symbol
+            cache_results: Whether to persist newly scored results in one transaction
+            
+        Returns:
+            List[SentimentResult]: Results in input order, omitting texts that failed
+        """
+        # Check cache first, one query for the whole batch
+        cache = self.db_handler.get_cached_sentiments_bulk([(source, text) for text, source, _ in items])
+        results: List[Optional[SentimentResult]] = []
+        misses = []
+        for text, source, pub_date in items:
+            cached = cache.get((source, text))
+            if not cached:
+                misses.append((len(results), text, source, pub_date))
+            results.append(cached)
+            
+        if misses:
+            scored = self._score_texts([(text, source, pub_date) for _, text, source, pub_date in misses],
+                                       symbol, cache_results=cache_results)
+            for (position, _, _, _), result in zip(misses, scored):
+                results[position] = result
+                
+        return [result for result in results if result]
+        
+    def _score_texts(self, items: List[Tuple[str, str, Optional[datetime]]], symbol: str,
+                     cache_results: bool) -> List[Optional[SentimentResult]]:
+        """
+        Score texts with the models, without consulting the cache.
+        
+        Args:
+            items: (text, source, pub_date) tuples; pub_date may be None
+            symbol: Financial instrument symbol
+            cache_results: Whether to persist the new results in one transaction
             
+        Returns:
+            List[Optional[SentimentResult]]: One entry per item, None where scoring failed
+        """
+        texts = [text for text, _, _ in items]
         try:
-            # Use pub_date if provided, otherwise fall back to current time
-            timestamp = pub_date if pub_date else datetime.now(timezone.utc)
+            vader_scores = self.analyze_vader_batch(texts)
+        except Exception as e:
+            self.error_handler.log_error(e, f"VADER analysis of {len(texts)} texts for {symbol}")
+            vader_scores = []
+        bert_scores, normalized_scores = self._combine_with_bert(texts, vader_scores, symbol) if vader_scores else ([], [])
+        
+        results: List[Optional[SentimentResult]] = [None] * len(items)
+        for position, ((text, source, pub_date), vader_score, bert_score, normalized_score) in enumerate(zip(
+                items, vader_scores, bert_scores, normalized_scores)):
+            results[position] = self._finalize(text, source, symbol, pub_date, vader_score, bert_score, normalized_score)
             
-            # VADER analysis
-            vader_scores = self.vader_analyzer.polarity_scores(text)
-            vader_score = vader_scores['compound']
+        if cache_results:
+            self.db_handler.cache_sentiment_results([result for result in results if result])
+        return results
+        
+    def _combine_with_bert(self, texts: List[str], vader_scores: List[float],
+                           symbol: str) -> Tuple[List[float], List[float]]:
+        """
+        Add BERT scores where VADER is unsure and combine both into normalized scores.
+        
+        Texts whose VADER compound exceeds VADER_CONFIDENT_SCORE in magnitude
+        skip the transformer: their BERT score is 0.0 and the VADER score is
+        used as the combined score.
+        
+        Args:
+            texts: Texts already scored by VADER
+            vader_scores: VADER compound scores in the same order
+            symbol: Financial instrument symbol, used in log messages
             
-            # BERT analysis with better text handling
-            bert_score = 0.0
-            try:
-                truncated_text = self._clean_and_truncate_text(text, max_length=100)
-                bert_result = self.bert_pipeline(truncated_text)[0]
-                bert_score = self._convert_bert_label_to_score(bert_result)
-            except Exception as e:
-                self.error_handler.log_error(e, f"BERT analysis for text from {source}")
-                bert_score = 0.0 
+        Returns:
+            Tuple[List[float], List[float]]: BERT scores and combined scores in input order
+        """
+        vader = np.asarray(vader_scores, dtype=np.float64)
+        confident = np.abs(vader) > VADER_CONFIDENT_SCORE
+        bert = np.zeros_like(vader)
+        
+        uncertain = np.flatnonzero(~confident)
+        if uncertain.size:
+            bert[uncertain] = self.analyze_bert_batch(
+                [texts[i] for i in uncertain], context=f"{uncertain.size} texts for {symbol}"
+            )
+        skipped = len(texts) - uncertain.size
+        if skipped:
+            self.error_handler.log_info(
+                "Skipped BERT for %d/%d texts (%.0f%%) with confident VADER scores for %s",
+                skipped, len(texts), 100 * skipped / len(texts), symbol
+            )
+            
+        # Combine the whole batch in one vectorized step
+        normalized = np.where(confident, vader, self._normalize_scores(vader, bert))
+        return bert.tolist(), normalized.tolist()
+        
+    def _finalize(self, text: str, source: str, symbol: str, pub_date: Optional[datetime],
+                  vader_score: float, bert_score: float, normalized_score: float) -> Optional[SentimentResult]:
+        """
+        Combine model scores for one text into a sentiment result.
+        
+        Args:
+            text: Text content that was scored
+            source: Source identifier
+            symbol: Financial instrument symbol
+            pub_date: Publication time, defaults to now
+            vader_score: VADER compound score
+            bert_score: BERT score
+            normalized_score: Combined score from `_normalize_scores`
             
-            # Normalized combined score
-            normalized_score = self._normalize_scores(vader_score, bert_score)
+        Returns:
+            Optional[SentimentResult]: Assembled result if successful
+        """
+        try:
+            # Use pub_date if provided, otherwise fall back to current time
+            timestamp = pub_date if pub_date else datetime.now(timezone.utc)
             
             # Extract keywords
             keywords = self._extract_keywords(text)
             
-            result = SentimentResult(
+            return SentimentResult(
                 symbol=symbol,
                 text=text,
                 source=source,
@@ -98,20 +279,150 @@ class Analyzer:
                 bert_score=bert_score,
                 normalized_score=normalized_score,
                 keywords=keywords
-            )   
-            self.db_handler.cache_sentiment_result(result)
-            return result
+            )
             
         except Exception as e:
             self.error_handler.log_error(e, f"analyzing text from {source}")
             return None
              
+    def analyze_vader_batch(self, texts: List[str]) -> List[float]:
+        """
+        Score texts with VADER, evaluating each distinct text once.
+        
+        Batches of more than VADER_POOL_THRESHOLD distinct texts are spread
+        over a lazily started process pool on multi-core hosts, since VADER
+        is pure Python.
+        
+        Args:
+            texts: Raw text contents to score
+            
+        Returns:
+            List[float]: VADER compound scores in input order
+        """
+        unique = list(dict.fromkeys(texts))
+        if len(unique) > VADER_POOL_THRESHOLD and (os.cpu_count() or 1) > 1:
+            try:
+                if self._vader_pool is None:
+                    # Spawned, not forked: the parent holds torch threads
+                    self._vader_pool = ProcessPoolExecutor(
+                        max_workers=os.cpu_count(),
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    # Shuts the workers down at exit or when this analyzer is collected,
+                    # without keeping the analyzer (and its model) alive until then
+                    self._vader_pool_finalizer = weakref.finalize(
+                        self, self._vader_pool.shutdown, cancel_futures=True
+                    )
+                compounds = list(self._vader_pool.map(vader_compound, unique, chunksize=32))
+            except Exception as e:
+                self.error_handler.log_error(e, "VADER worker pool, scoring in-process")
+                self.close()
+                compounds = [self.vader_analyzer.polarity_scores(text)['compound'] for text in unique]
+        else:
+            polarity_scores = self.vader_analyzer.polarity_scores
+            compounds = [polarity_scores(text)['compound'] for text in unique]
+            
+        scores = dict(zip(unique, compounds))
+        return [scores[text] for text in texts]
+        
+    def close(self) -> None:
+        """Shut down the VADER worker pool, cancelling queued work; later batches start a new one."""
+        pool, self._vader_pool = self._vader_pool, None
+        finalizer, self._vader_pool_finalizer = self._vader_pool_finalizer, None
+        if finalizer is not None:
+            finalizer.detach()
+        if pool is not None:
+            try:
+                pool.shutdown(cancel_futures=True)
+            except Exception as e:
+                self.error_handler.log_error(e, "shutting down VADER worker pool")
+        
+    def analyze_bert_batch(self, texts: List[str], context: str = "batch") -> List[float]:
+        """
+        Score texts with the BERT model in batched forward passes.
+        
+        Identical texts after cleaning (headlines often repeat across feeds)
+        are scored once, and larger inputs are ordered by token length so
+        each batch is padded only to its own longest text.
+        
+        Args:
+            texts: Raw text contents to score
+            context: Description used when logging a failed batch
+            
+        Returns:
+            List[float]: BERT scores (-1 to 1) in input order, 0.0 on failure
+        """
+        cleaned = [self._clean_and_truncate_text(text, max_length=100) for text in texts]
+        unique = list(dict.fromkeys(cleaned))
+        if not unique:
+            return []
+            
+        try:
+            if len(unique) > BERT_BATCH_SIZE:
+                # Group similar lengths so each batch pads only to its own longest text
+                lengths = self.bert_pipeline.tokenizer(unique, truncation=True, return_length=True)["length"]
+                unique = [unique[i] for i in np.argsort(lengths, kind="stable")[::-1]]
+            batch_scores = [self._score_bert_batch(unique[start:start + BERT_BATCH_SIZE])
+                            for start in range(0, len(unique), BERT_BATCH_SIZE)]
+            scores = dict(zip(unique, np.concatenate(batch_scores).tolist()))
+        except Exception as e:
+            self.error_handler.log_error(e, f"BERT analysis for {context}")
+            return [0.0] * len(texts)
+            
+        return [scores[text] for text in cleaned]
+             
+    def _score_bert_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Run one padded forward pass and turn the top class of each text into a signed score.
+        
+        Args:
+            texts: Cleaned texts forming a single batch
+            
+        Returns:
+            np.ndarray: Top-class probability signed by its label (-1 to 1)
+        """
+        with torch.inference_mode():
+            encoded = self._bert_tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+            logits = self._bert_model(**encoded.to(self.bert_pipeline.device)).logits
+            confidences, labels = logits.float().softmax(-1).max(-1)
+        return self._bert_signs[labels.cpu().numpy()] * confidences.cpu().numpy()
+        
+    def _load_onnx_pipeline(self) -> Optional[Any]:
+        """
+        Build the sentiment pipeline on an ONNX Runtime export of the model.
+        
+        Returns:
+            Optional[Pipeline]: ONNX-backed pipeline, or None if optimum is
+                unavailable or the export fails
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            from transformers import AutoTokenizer
+        except ImportError:
+            self.error_handler.log_warning("optimum[onnxruntime] is not installed, using torch backend")
+            return None
+            
+        try:
+            model = ORTModelForSequenceClassification.from_pretrained(
+                BERT_MODEL, export=True, provider="CPUExecutionProvider"
+            )
+            return pipeline("sentiment-analysis", model=model, tokenizer=AutoTokenizer.from_pretrained(BERT_MODEL))
+        except Exception as e:
+            self.error_handler.log_error(e, "exporting BERT model to ONNX, using torch backend")
+            return None
+            
+    def _quantize_bert_model(self) -> None:
+        """Swap the BERT model's linear layers for dynamic int8 equivalents."""
+        try:
+            self.bert_pipeline.model = torch.ao.quantization.quantize_dynamic(
+                self.bert_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            self.error_handler.log_error(e, "quantizing BERT model, keeping fp32")
+             
     def _clean_and_truncate_text(self, text: str, max_length: int = 100) -> str:
         """Clean and truncate text for BERT analysis."""
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\@\w+|\#', '', text)
-        text = text.strip()[:max_length] 
-        return text
+        return _STRIP_RE.sub('', text).strip()[:max_length]
             
     def _convert_bert_label_to_score(self, bert_result: Dict) -> float:
         """
@@ -132,16 +443,17 @@ class Analyzer:
             return -score
         return 0  # neutral
         
-    def _normalize_scores(self, vader_score: float, bert_score: float) -> float:
+    def _normalize_scores(self, vader_score: Union[float, np.ndarray],
+                          bert_score: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Normalize and combine scores from different analyzers.
         
         Args:
-            vader_score: VADER sentiment score
-            bert_score: BERT sentiment score
+            vader_score: VADER sentiment score, or an array of them
+            bert_score: BERT sentiment score, or an array of them
             
         Returns:
-            float: Combined normalized score (-1 to 1)
+            Union[float, np.ndarray]: Combined normalized score(s) (-1 to 1)
         """
         # Simple weighted average
         return (vader_score * 0.6 + bert_score * 0.4)
@@ -158,7 +470,5 @@ class Analyzer:
             List of extracted keywords
         """
         # TODO: use TF-IDF, RAKE, etc.
-        words = [word.lower() for word in text.split() if len(word) > 3]
-        word_counts = {word: words.count(word) for word in set(words)}
-        sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
-        return [word[0] for word in sorted_words[:top_n]]
+        words = text.lower().translate(_PUNCT_TABLE).split()
+        return [word for word, _ in Counter(word for word in words if len(word) > 3).most_common(top_n)]
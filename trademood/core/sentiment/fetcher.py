@@ -1,12 +1,127 @@
+import functools
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Iterator, Optional
+from urllib.parse import urlparse
 from dateutil import parser
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
-from data.defs import DEFAULT_SOURCES, SYMBOL_MAPPING
+from data.defs import DEFAULT_SOURCES, SYMBOL_MAPPING, resolved_rss_urls
+
+# Upper bound on feeds requested at once; fetching is network-bound
+MAX_FETCH_WORKERS = 16
+
+# RSS items under the document root, compiled once for every feed parsed
+_ITEM_XPATH = ET.XPath('./channel/item')
+
+# Scrape selectors repeat every tick; compile each once
+_compile_selector = functools.lru_cache(maxsize=64)(soupsieve.compile)
+
+# Selectors that are a bare tag name, which SoupStrainer can apply while parsing
+_TAG_SELECTOR_RE = re.compile(r'[A-Za-z][A-Za-z0-9]*')
+
+
+@functools.lru_cache(maxsize=64)
+def _selector_strainer(selector: str) -> Optional[SoupStrainer]:
+    """
+    Build a strainer that parses only the elements a selector can match.
+    
+    Args:
+        selector: CSS selector for the scraped elements
+        
+    Returns:
+        Optional[SoupStrainer]: Strainer for bare tag selectors, None when the
+            whole document must be parsed
+    """
+    return SoupStrainer(selector) if _TAG_SELECTOR_RE.fullmatch(selector) else None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_pub_date(pub_date: str) -> datetime:
+    """
+    Parse an RSS pubDate into a timezone-aware datetime.
+    
+    RFC-822 dates take the email.utils fast path; anything else falls back
+    to dateutil. Naive results are taken as UTC.
+    
+    Args:
+        pub_date: Raw pubDate text
+        
+    Returns:
+        datetime: Parsed publication time
+    """
+    try:
+        published = parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError):
+        published = parser.parse(pub_date)
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+
+# Requests per second allowed against any single host
+MAX_REQUESTS_PER_HOST = 10
+
+
+class HostRateLimiter:
+    """
+    A class used to space out requests to each host as a leaky bucket.
+
+    Every request to a host is given the next free slot on that host's
+    schedule, with slots `1 / rate` seconds apart, and the calling thread
+    sleeps until its slot. Concurrent fetch workers therefore never burst
+    past a provider's throttle, regardless of how many feeds share a host.
+
+    Attributes
+    ----------
+    interval : float
+        Minimum spacing in seconds between two requests to the same host.
+
+    Methods
+    -------
+    acquire(url)
+        Blocks until a request to the URL's host may be sent.
+    """
+
+    def __init__(self, rate: float = MAX_REQUESTS_PER_HOST):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Requests per second allowed for each host
+        """
+        self.interval = 1.0 / rate
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the URL's host may be sent.
+
+        Args:
+            url: URL about to be requested
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Shared by every Fetcher so dashboard and scheduled runs draw from one budget
+_HOST_LIMITER = HostRateLimiter()
 
 class Fetcher:
     """
@@ -27,6 +142,9 @@ class Fetcher:
     db_handler : DatabaseHandler
         An instance of the `DatabaseHandler` for persisting the fetched raw data
         or sentiment results derived from it.
+    session : requests.Session
+        A keep-alive HTTP session shared by all fetch workers, so repeated
+        requests to a host reuse pooled connections.
 
     Methods
     -------
@@ -38,6 +156,8 @@ class Fetcher:
         Retrieves relevant news headlines for a given financial symbol.
     fetch_all_sentiment_data()
         Orchestrates the fetching of sentiment data from all configured sources.
+    iter_sources()
+        Yields each source's entries as soon as that source has been fetched.
     """
 
     
@@ -59,6 +179,28 @@ class Fetcher:
         self.sources = sources
         self.error_handler = error_handler or ErrorHandler()
         self.db_handler = db_handler or DatabaseHandler()
+        self.session = self._create_session()
+        
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create a compressed, keep-alive HTTP session for every fetch worker.
+        
+        Transient gateway errors are retried with backoff; 429s are left to
+        the caller so throttling is logged rather than hammered. Server
+        Retry-After delays are not honored here, so one throttled feed cannot
+        stall a fetch worker for the rest of the tick.
+        """
+        session = requests.Session()
+        session.headers.update({"User-Agent": "Mozilla/5.0", "Accept-Encoding": "gzip, deflate"})
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                        allowed_methods=("GET",), raise_on_status=False,
+                        respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS,
+                              max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
         
     def fetch_all_sources(self) -> List[Dict[str, Any]]:
         """
@@ -68,34 +210,51 @@ class Fetcher:
             List of dictionaries containing source content with metadata
         """
         results = []
+        for entries in self.iter_sources(ordered=True):
+            results.extend(entries)
+        return results
         
-        # Fetch RSS feeds
+    def iter_sources(self, ordered: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the entries of each configured source as it is fetched.
+        
+        Feeds and pages download concurrently, so consumers can start analyzing the
+        first feed to arrive while the rest are still in flight.
+        
+        Args:
+            ordered: Yield sources in configuration order instead of completion order
+            
+        Returns:
+            Iterator over per-source lists of content dictionaries
+        """
+        jobs = []
         if 'rss' in self.sources:
-            for rss_url in self.sources['rss']:
-                try:
-                    # Format URL with appropriate symbol
-                    formatted_url = rss_url.format(
-                        yahoo_symbol=self.symbol,
-                        google_symbol=self.google_symbol
-                    )
-                    rss_results = self._fetch_rss_feed(formatted_url)
-                    results.extend(rss_results)
-                except Exception as e:
-                    self.error_handler.log_error(e, f"fetching RSS feed {rss_url}")
-                    
-        # Scrape web content (unchanged)
+            try:
+                feed_urls = resolved_rss_urls(self.symbol, tuple(self.sources['rss']))
+            except Exception as e:
+                self.error_handler.log_error(e, "formatting RSS feed URLs")
+                feed_urls = ()
+            jobs.extend((f"fetching RSS feed {url}", self._fetch_rss_feed, (url,)) for url in feed_urls)
+            
         if 'scraping' in self.sources:
-            for scraping_config in self.sources['scraping']:
+            jobs.extend(
+                (f"scraping {config['url']}", self._scrape_web_content, (config['url'], config['selectors']))
+                for config in self.sources['scraping']
+            )
+            
+        if not jobs:
+            return
+            
+        # Every source downloads concurrently so a tick costs the slowest one, not the sum
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(jobs))) as executor:
+            futures = {executor.submit(fetch, *args): context for context, fetch, args in jobs}
+            for future in (futures if ordered else as_completed(futures)):
                 try:
-                    scrape_results = self._scrape_web_content(
-                        scraping_config['url'],
-                        scraping_config['selectors']
-                    )
-                    results.extend(scrape_results)
+                    entries = future.result()
                 except Exception as e:
-                    self.error_handler.log_error(e, f"scraping {scraping_config['url']}")
-                    
-        return results
+                    self.error_handler.log_error(e, futures[future])
+                    continue
+                yield entries
 
     def _fetch_rss_feed(self, feed_url: str) -> List[Dict[str, Any]]:
         """
@@ -108,26 +267,37 @@ class Fetcher:
             List of parsed feed entries with metadata
         """
         try:
-            response = requests.get(feed_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+            _HOST_LIMITER.acquire(feed_url)
+            response = self.session.get(feed_url, timeout=10)
+            if response.status_code == 429:
+                self.error_handler.log_warning(
+                    f"Throttled by {urlparse(feed_url).netloc}, "
+                    f"retry after {response.headers.get('Retry-After', 'unknown')}s",
+                    context=feed_url
+                )
+                return []
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             self.error_handler.log_error(e, f"fetching feed {feed_url}")
             return []
         try:
-            root = ET.fromstring(response.content)
+            # Parsers aren't shared between fetch threads; recover from sloppy feeds
+            xml_parser = ET.XMLParser(recover=True, resolve_entities=False, no_network=True)
+            root = ET.fromstring(response.content, parser=xml_parser)
         except ET.ParseError as e:
             self.error_handler.log_error(e, f"parsing XML from {feed_url}")
             return []
+        if root is None:
+            self.error_handler.log_warning("Feed contained no parseable XML", context=feed_url)
+            return []
         entries = []
-        for item in root.findall('./channel/item'):
+        for item in _ITEM_XPATH(root):
             title = item.findtext('title', default='').strip()
             link = item.findtext('link', default='').strip()
             description = item.findtext('description', default='').strip()
             pubDate = item.findtext('pubDate', default='').strip()
             try:
-                published = parser.parse(pubDate) if pubDate else datetime.now(timezone.utc)
-                if published.tzinfo is None:
-                    published = published.replace(tzinfo=timezone.utc)
+                published = _parse_pub_date(pubDate) if pubDate else datetime.now(timezone.utc)
             except Exception as e:
                 self.error_handler.log_warning(f"Failed to parse pubDate '{pubDate}': {str(e)}")
                 published = datetime.now(timezone.utc)
@@ -153,11 +323,12 @@ class Fetcher:
             List of scraped content items with metadata
         """
         try:
-            response = requests.get(url, timeout=10)
+            _HOST_LIMITER.acquire(url)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            headlines = soup.select(selectors['headlines'])
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=_selector_strainer(selectors['headlines']))
+            headlines = _compile_selector(selectors['headlines']).select(soup)
             
             return [{
                 'source': url,
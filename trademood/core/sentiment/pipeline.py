@@ -1,13 +1,24 @@
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import yfinance as yf
 from trademood.core.error_handler import ErrorHandler
+from trademood.core.models.sentiment_batch import SentimentBatch
 from trademood.core.sentiment.fetcher import Fetcher
 from trademood.core.sentiment.analyzer import Analyzer
 from trademood.core.sentiment.trend_generator import TrendGenerator
 from trademood.core.sentiment.signal_generator import SignalGenerator
 
+# Seconds a fetched close price is reused before yfinance is queried again
+PRICE_CACHE_TTL = 60
+
+# Minutes between deletions of sentiment results past their cache TTL
+CACHE_PURGE_INTERVAL = 60
+
 class Pipeline:
     """
     A class used to coordinate and schedule the execution of the entire sentiment analysis pipeline.
@@ -18,9 +29,10 @@ class Pipeline:
 
     Attributes
     ----------
-    scheduler : BackgroundScheduler
-        An instance of APScheduler's `BackgroundScheduler` for managing and
-        executing scheduled tasks (e.g., daily sentiment fetches, hourly trend updates).
+    scheduler : BaseScheduler
+        An APScheduler scheduler for managing and executing scheduled tasks
+        (e.g., daily sentiment fetches, hourly trend updates). Defaults to a
+        `BackgroundScheduler`; event-loop hosts pass an `AsyncIOScheduler`.
     fetcher : Fetcher
         An instance of the `Fetcher` to acquire raw sentiment data.
     analyzer : Analyzer
@@ -49,7 +61,8 @@ class Pipeline:
                 trend_generator: TrendGenerator,
                 trading_generator: SignalGenerator,
                 error_handler: ErrorHandler = None,
-                update_frequency: str = "1h"):
+                update_frequency: str = "1h",
+                scheduler: Optional[BaseScheduler] = None):
         """
         Initialize the pipeline runner with component instances.
         
@@ -60,41 +73,44 @@ class Pipeline:
             trading_generator: SignalGenerator instance
             error_handler: ErrorHandler instance
             update_frequency: Data update frequency (e.g., '5m', '1h')
+            scheduler: APScheduler scheduler to register runs on, defaults to
+                a new BackgroundScheduler
         """
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = scheduler or BackgroundScheduler()
         self.fetcher = fetcher
         self.analyzer = analyzer
         self.trend_generator = trend_generator
         self.trading_generator = trading_generator
         self.error_handler = error_handler or ErrorHandler()
         self.update_frequency = update_frequency 
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
          
     def run_pipeline(self, symbol: str = "GC=F") -> None:
         """Execute the full sentiment analysis pipeline."""
         try:
             self.error_handler.log_info("Starting sentiment pipeline")
             
-            # Fetch content
-            content_items = self.fetcher.fetch_all_sources()
-            self.error_handler.log_info(f"Fetched {len(content_items)} content items from sources")
-            
-            # Analyze sentiment
+            # Analyze each source as it arrives while the remaining feeds download
+            fetched = 0
             sentiment_results = []
-            for item in content_items:
-                result = self.analyzer.analyze_text(
-                    text=f"{item['title']} {item['summary']}".strip(),
-                    source=item['source'],
-                    symbol=symbol,
-                    pub_date=item.get('published')
-                )
-                if result:
-                    sentiment_results.append(result)
+            for content_items in self.fetcher.iter_sources():
+                fetched += len(content_items)
+                sentiment_results.extend(self.analyzer.analyze_texts(
+                    [(f"{item['title']} {item['summary']}".strip(), item['source'], item.get('published'))
+                     for item in content_items],
+                    symbol=symbol
+                ))
+            self.error_handler.log_info(f"Fetched {fetched} content items from sources")
                     
+            # Persist the whole tick in one transaction
+            self.analyzer.db_handler.cache_sentiment_results(sentiment_results)
             self.error_handler.log_info(f"Analyzed {len(sentiment_results)} sentiment results")
             
             # Generate trend signals
             if sentiment_results:
-                trend_signal = self.trend_generator.generate_trend_signals(sentiment_results)
+                trend_signal = self.trend_generator.generate_trend_signals(
+                    SentimentBatch.from_results(sentiment_results)
+                )
                 
                 if trend_signal:
                     self.error_handler.log_info(
@@ -104,20 +120,7 @@ class Pipeline:
                     )
                     
                     # Generate trading signals
-                    try:
-                        ticker = yf.Ticker(symbol)
-                        price_data = ticker.history(period="5d")
-                        if price_data.empty:
-                            self.error_handler.log_warning(f"No price data for {symbol}, trying 30d period")
-                            price_data = ticker.history(period="30d")
-                        if price_data.empty:
-                            self.error_handler.log_warning(f"No price data available for {symbol}")
-                            current_price = 0.0
-                        else:
-                            current_price = price_data["Close"].iloc[-1]
-                    except Exception as e:
-                        self.error_handler.log_error(e, f"fetching price for {symbol}")
-                        current_price = 0.0
+                    current_price = self._get_current_price(symbol)
                     
                     trading_signal = self.trading_generator.generate_trading_signal(
                         symbol=symbol,
@@ -140,6 +143,43 @@ class Pipeline:
         except Exception as e:
             self.error_handler.log_error(e, "running sentiment pipeline", raise_exception=True)
         
+    def _get_current_price(self, symbol: str) -> float:
+        """
+        Get the latest close for a symbol, reusing a fetch younger than PRICE_CACHE_TTL.
+        
+        Args:
+            symbol: Financial instrument symbol
+            
+        Returns:
+            float: Latest close price, 0.0 if unavailable
+        """
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+            
+        try:
+            ticker = yf.Ticker(symbol)
+            price_data = ticker.history(period="5d", prepost=False, actions=False)
+            if price_data.empty:
+                self.error_handler.log_warning(f"No price data for {symbol}, trying 30d period")
+                price_data = ticker.history(period="30d", prepost=False, actions=False)
+            if price_data.empty:
+                self.error_handler.log_warning(f"No price data available for {symbol}")
+                return 0.0
+        except Exception as e:
+            self.error_handler.log_error(e, f"fetching price for {symbol}")
+            return 0.0
+            
+        current_price = float(price_data["Close"].iloc[-1])
+        self._price_cache[symbol] = (time.monotonic(), current_price)
+        return current_price
+        
+    def _purge_expired_sentiment(self) -> None:
+        """Delete cached sentiment results whose TTL has elapsed."""
+        removed = self.analyzer.db_handler.remove_expired()
+        if removed:
+            self.error_handler.log_info(f"Removed {removed} expired sentiment results")
+        
     def start_scheduled_runs(self) -> None:
         """
         Start scheduled execution of the pipeline based on update_frequency.
@@ -168,6 +208,12 @@ class Pipeline:
                 kwargs={'symbol': self.fetcher.symbol},
                 next_run_time=datetime.now()
             )
+            # Expired cache rows are purged around the clock, market hours or not
+            self.scheduler.add_job(
+                self._purge_expired_sentiment,
+                IntervalTrigger(minutes=CACHE_PURGE_INTERVAL),
+                next_run_time=datetime.now()
+            )
             self.scheduler.start()
             self.error_handler.log_info(f"Started scheduled runs every {interval_minutes} minutes during COMEX trading hours")
         except Exception as e:
@@ -1,10 +1,14 @@
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+import numpy as np
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
 from trademood.core.models.trading_signal import TradingSignal
 from trademood.core.models.trend_signal import TrendSignal
 
+# Signal labels indexed by the int8 codes of `generate_trading_signals_bulk`
+SIGNAL_LABELS = ("HOLD", "BUY", "SELL")
+
 class SignalGenerator:
     """
     A class used to generate actionable trading signals by combining sentiment trends with price data.
@@ -35,6 +39,8 @@ class SignalGenerator:
     generate_signal(symbol)
         Generates a `TradingSignal` object for a specified financial symbol,
         considering both sentiment and price data.
+    generate_trading_signals_bulk(short_term_trends, trend_strengths)
+        Applies the signal rules to whole arrays of trend values at once.
     """
     
     def __init__(self, 
@@ -107,3 +113,29 @@ class SignalGenerator:
         except Exception as e:
             self.error_handler.log_error(e, "generating trading signal")
             return None
+            
+    def generate_trading_signals_bulk(self,
+                                      short_term_trends: np.ndarray,
+                                      trend_strengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply the signal rules of `generate_trading_signal` to arrays of trends.
+        
+        Args:
+            short_term_trends: Short-term trend value per item
+            trend_strengths: Trend strength per item
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: int8 signal codes indexing
+                SIGNAL_LABELS (0=HOLD, 1=BUY, 2=SELL) and float confidences
+        """
+        short_term_trends = np.asarray(short_term_trends, dtype=np.float64)
+        trend_strengths = np.asarray(trend_strengths, dtype=np.float64)
+        
+        confidences = np.minimum(np.abs(short_term_trends), trend_strengths)
+        codes = np.zeros(short_term_trends.shape, dtype=np.int8)
+        codes[short_term_trends > self.thresholds['buy']] = 1
+        codes[short_term_trends < self.thresholds['sell']] = 2
+        
+        # Only act if confidence exceeds threshold
+        codes[confidences < self.thresholds['confidence_threshold']] = 0
+        return codes, confidences
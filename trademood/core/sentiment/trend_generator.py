@@ -1,12 +1,134 @@
+from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Dict, Optional
+from math import isfinite
+from typing import List, Dict, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
 from trademood.core.models.sentiment_result import SentimentResult
+from trademood.core.models.sentiment_batch import SentimentBatch
 from trademood.core.models.trend_signal import TrendSignal
 
+# Bound once; every generated signal is stamped through it
+_now = datetime.now
+
+# Signals kept for repeat calls on unchanged history; least recently used dropped first
+TREND_CACHE_SIZE = 128
+
+# Pandas resample rule for each supported update frequency
+_FREQ_MAP = {
+    "5m": "5min",
+    "15m": "15min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D"
+}
+
+
+
+def _bucket_means(timestamps_ns: np.ndarray, scores: np.ndarray, freq_ns: int) -> np.ndarray:
+    """
+    Average scores into consecutive fixed-width time buckets.
+    
+    Buckets are aligned to the epoch, which for the supported frequencies
+    (all dividing a day) matches pandas' default resample bins. Buckets
+    with no scores are NaN.
+    
+    Args:
+        timestamps_ns: Sorted timestamps as int64 nanoseconds
+        scores: Scores aligned with timestamps
+        freq_ns: Bucket width in nanoseconds
+        
+    Returns:
+        np.ndarray: Mean score per bucket from the first to the last timestamp
+    """
+    bucket = timestamps_ns // freq_ns
+    bucket -= bucket[0]
+    sums = np.bincount(bucket, weights=scores)
+    counts = np.bincount(bucket)
+    return np.divide(sums, counts, out=np.full(sums.size, np.nan), where=counts > 0)
+
+
+def _ffill_inplace(values: np.ndarray) -> np.ndarray:
+    """
+    Forward-fill NaNs in place with the last preceding valid value.
+    
+    Leading NaNs have nothing to carry forward and are left as they are.
+    
+    Args:
+        values: Float array in time order, modified in place
+        
+    Returns:
+        np.ndarray: The same array, for chaining
+    """
+    missing = values != values
+    if missing.any():
+        # Index of the latest valid value at or before each position
+        source = np.where(missing, 0, np.arange(values.size))
+        np.maximum.accumulate(source, out=source)
+        values[:] = values[source]
+    return values
+
+
+def _tail_means(scores: np.ndarray, short_window: int, medium_window: int,
+                long_window: int) -> Tuple[float, float, float, bool]:
+    """
+    Compute the latest short, medium and long window means in one pass.
+    
+    Only the final value of each rolling mean is needed, so the tail of the
+    longest window is summed once, newest first, and each mean is read off
+    the running sum at its window length.
+    
+    Args:
+        scores: Resampled scores in time order
+        short_window: Short-term window length
+        medium_window: Medium-term window length
+        long_window: Long-term window length
+        
+    Returns:
+        Tuple[float, float, float, bool]: The three means and whether they are
+            valid, False when there are fewer scores than the longest window or
+            the tail holds a NaN or infinite value
+    """
+    longest = max(short_window, medium_window, long_window)
+    if scores.size < longest:
+        return 0.0, 0.0, 0.0, False
+    running = np.cumsum(scores[-longest:][::-1])
+    # A NaN or infinity anywhere in the tail carries through to the full sum
+    if not isfinite(running[-1]):
+        return 0.0, 0.0, 0.0, False
+    return (float(running[short_window - 1] / short_window),
+            float(running[medium_window - 1] / medium_window),
+            float(running[long_window - 1] / long_window),
+            True)
+
+
+def _trend_kernel(short: float, medium: float, long: float) -> Tuple[float, int]:
+    """
+    Compute trend strength and direction from the three window means in one call.
+    
+    Strength is the divergence between adjacent time frames scaled to 0-1;
+    direction is 1 when the means are strictly rising toward the short
+    term, -1 when strictly falling, and 0 otherwise.
+    
+    Args:
+        short: Short-term trend value
+        medium: Medium-term trend value
+        long: Long-term trend value
+        
+    Returns:
+        Tuple[float, int]: Normalized trend strength (0-1) and direction (-1, 0, 1)
+    """
+    scaled = (abs(short - medium) + abs(medium - long)) * 10.0
+    strength = scaled if scaled < 1.0 else 1.0
+    if short > medium > long:
+        return strength, 1
+    if short < medium < long:
+        return strength, -1
+    return strength, 0
+
 
 class TrendGenerator:
     """
@@ -40,6 +162,11 @@ class TrendGenerator:
     generate_signals(symbol)
         Generates comprehensive trend signals for a given financial symbol
         based on its historical sentiment data.
+    generate_trend_signals_from_arrays(timestamps, scores)
+        Generates trend signals from timestamp and score arrays, such as those
+        returned by `DatabaseHandler.get_sentiment_arrays`.
+    generate_trend_signals_batch(sentiment_by_symbol)
+        Generates trend signals for many symbols with one grouped resample.
     """
     
     def __init__(self, 
@@ -64,116 +191,230 @@ class TrendGenerator:
         self.error_handler = error_handler or ErrorHandler()
         self.db_handler = db_handler or DatabaseHandler()
         self.update_frequency = update_frequency
+        self._windows = (
+            self.window_sizes['short_term'],
+            self.window_sizes['medium_term'],
+            self.window_sizes['long_term']
+        )
+        self._max_window = max(self.window_sizes.values())
+        self._resample_freq = _FREQ_MAP.get(update_frequency, "1h")
+        self._freq_ns = pd.Timedelta(self._resample_freq).value
+        # Not functools.lru_cache: the key is derived from unhashable arrays,
+        # and failed computations must not be remembered
+        self._signal_cache: OrderedDict[Tuple, TrendSignal] = OrderedDict()
+        self._resample_state: Optional[Tuple] = None
 
-    def generate_trend_signals(self, sentiment_data: List[SentimentResult]) -> Optional[TrendSignal]:
+    def generate_trend_signals(self, sentiment_data: Union[SentimentBatch, List[SentimentResult]]) -> Optional[TrendSignal]:
         """
         Generate trend signals from sentiment data, aggregated by update_frequency.
         
         Args:
-            sentiment_data: List of sentiment results over time
+            sentiment_data: Sentiment results over time, as a batch or a list
             
         Returns:
             Optional[TrendSignal]: Computed trend signal if successful
         """
-        if not sentiment_data or len(sentiment_data) < max(self.window_sizes.values()):
+        if not sentiment_data or len(sentiment_data) < self._max_window:
             self.error_handler.log_warning("Insufficient data for trend analysis")
             return None
             
         try:
-            # Convert to DataFrame for analysis
-            df = pd.DataFrame([{
-                'timestamp': sr.timestamp,
-                'score': sr.normalized_score
-            } for sr in sentiment_data])
-            
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            
-            # Resample based on update_frequency
-            freq_map = {
-                "5m": "5min",
-                "15m": "15min",
-                "1h": "1h",
-                "4h": "4h",
-                "1d": "1d"
-            }
-            resample_freq = freq_map.get(self.update_frequency, "1h")
-            
-            df = df.set_index('timestamp').resample(resample_freq).mean().ffill()
-            
-            # Check if enough data for all windows
-            min_required = max(self.window_sizes.values())
-            if len(df) < min_required:
-                self.error_handler.log_warning(f"Only {len(df)} data points after resampling, need at least {min_required}")
-                return None
-            
-            # Calculate rolling averages for different time windows
-            short_term = df['score'].rolling(
-                window=self.window_sizes['short_term']
-            ).mean().iloc[-1]
-            
-            medium_term = df['score'].rolling(
-                window=self.window_sizes['medium_term']
-            ).mean().iloc[-1]
-            
-            long_term = df['score'].rolling(
-                window=self.window_sizes['long_term']
-            ).mean().iloc[-1]
-            
-            # Check for nan values
-            if any(np.isnan(x) for x in [short_term, medium_term, long_term]):
-                self.error_handler.log_warning("NaN values in trend calculations, insufficient data")
-                return None
+            timestamps, scores = self._sentiment_arrays(sentiment_data)
+        except Exception as e:
+            self.error_handler.log_error(e, "generating trend signals")
+            return None
+        return self.generate_trend_signals_from_arrays(timestamps, scores)
+        
+    def generate_trend_signals_from_arrays(self, timestamps: np.ndarray, scores: np.ndarray) -> Optional[TrendSignal]:
+        """
+        Generate trend signals from columnar sentiment history.
+        
+        Args:
+            timestamps: datetime64[ns] timestamps, in any order
+            scores: Normalized scores aligned with timestamps
             
-            # Calculate trend strength and direction
-            trend_strength = self._calculate_trend_strength(short_term, medium_term, long_term)
-            change_direction = self._determine_direction(short_term, medium_term, long_term)
+        Returns:
+            Optional[TrendSignal]: Computed trend signal if successful
+        """
+        if len(scores) < self._max_window:
+            self.error_handler.log_warning("Insufficient data for trend analysis")
+            return None
             
-            # Create trend signal
-            signal = TrendSignal(
-                timestamp=datetime.now(),
-                short_term_trend=short_term,
-                medium_term_trend=medium_term,
-                long_term_trend=long_term,
-                trend_strength=trend_strength,
-                change_direction=change_direction
-            )
+        try:
+            # Repeat calls within a bucket see the same history; reuse their signal
+            key = (len(scores), int(timestamps[0].view('i8')), int(timestamps[-1].view('i8')),
+                   float(scores[0]), float(scores[-1]), float(scores.sum()))
+            cached = self._signal_cache.get(key)
+            if cached is not None:
+                self._signal_cache.move_to_end(key)
+                return replace(cached, timestamp=_now())
+                
+            # Order the columns by time, then resample based on update_frequency
+            order = np.argsort(timestamps, kind='stable')
+            resampled = self._resample_scores(timestamps[order].view('i8'), scores[order])
             
-            return signal
+            signal = self._signal_from_resampled(resampled)
             
         except Exception as e:
             self.error_handler.log_error(e, "generating trend signals")
             return None
+            
+        if signal is not None:
+            self._signal_cache[key] = signal
+            if len(self._signal_cache) > TREND_CACHE_SIZE:
+                self._signal_cache.popitem(last=False)
+        return signal
          
-    def _calculate_trend_strength(self, short: float, medium: float, long: float) -> float:
+    def generate_trend_signals_batch(
+            self, sentiment_by_symbol: Dict[str, Union[SentimentBatch, List[SentimentResult]]]
+    ) -> Dict[str, Optional[TrendSignal]]:
+        """
+        Generate trend signals for many symbols with one grouped resample.
+        
+        Args:
+            sentiment_by_symbol: Sentiment results over time for each symbol,
+                as batches or lists
+            
+        Returns:
+            Dict[str, Optional[TrendSignal]]: Trend signal per symbol, None where
+                there was insufficient data or the computation failed
+        """
+        signals: Dict[str, Optional[TrendSignal]] = dict.fromkeys(sentiment_by_symbol)
+        try:
+            frames = []
+            for symbol, sentiment_data in sentiment_by_symbol.items():
+                if not sentiment_data or len(sentiment_data) < self._max_window:
+                    self.error_handler.log_warning("Insufficient data for trend analysis of %s", symbol)
+                    continue
+                timestamps, scores = self._sentiment_arrays(sentiment_data)
+                frames.append(pd.DataFrame({'symbol': symbol, 'timestamp': timestamps, 'score': scores}))
+            if not frames:
+                return signals
+                
+            # One resample for every symbol, then forward-fill within each symbol
+            df = pd.concat(frames, ignore_index=True).set_index('timestamp')
+            resampled = df.groupby('symbol', sort=False)['score'].resample(self._resample_freq).mean()
+            now = _now()
+            for symbol, values in resampled.groupby(level=0, sort=False):
+                signals[symbol] = self._signal_from_resampled(_ffill_inplace(values.to_numpy(copy=True)), now)
+                
+        except Exception as e:
+            self.error_handler.log_error(e, "generating batch trend signals")
+        return signals
+        
+    def _resample_scores(self, timestamps_ns: np.ndarray, scores: np.ndarray) -> np.ndarray:
         """
-        Calculate the strength of the trend based on divergence between time frames.
+        Resample time-ordered scores to update_frequency, reusing the previous call's buckets.
+        
+        When the history extends the one seen last time (same leading points,
+        new points strictly later), only the new points are bucketed and merged
+        into the stored tail, so the result holds just the latest `_max_window`
+        buckets. Any other history is resampled in full.
         
         Args:
-            short: Short-term trend value
-            medium: Medium-term trend value
-            long: Long-term trend value
+            timestamps_ns: Sorted timestamps as int64 nanoseconds
+            scores: Scores aligned with timestamps
             
         Returns:
-            float: Normalized trend strength (0-1)
+            np.ndarray: Forward-filled bucket means, oldest first
         """
-        divergence = abs(short - medium) + abs(medium - long)
-        return min(divergence * 10, 1.0)
+        state = self._resample_state
+        if state is not None:
+            count, last_ns, prefix_sum, last_bucket, bucket_sum, bucket_count, tail = state
+            if (len(scores) > count and timestamps_ns[count - 1] == last_ns
+                    and timestamps_ns[count] > last_ns and scores[:count].sum() == prefix_sum):
+                # The stored last bucket may still be filling; fold it into the new range
+                offsets = timestamps_ns[count:] // self._freq_ns - last_bucket
+                sums = np.bincount(offsets, weights=scores[count:])
+                counts = np.bincount(offsets)
+                sums[0] += bucket_sum
+                counts[0] += bucket_count
+                means = _ffill_inplace(np.divide(sums, counts, out=np.full(sums.size, np.nan), where=counts > 0))
+                resampled = np.concatenate((tail[:-1], means))[-self._max_window:]
+                self._save_resample_state(timestamps_ns, scores, resampled)
+                return resampled
+                
+        # Points already spaced exactly one period apart each fill their own bucket
+        diffs = np.diff(timestamps_ns)
+        if diffs.size and (diffs == self._freq_ns).all():
+            resampled = scores
+        else:
+            resampled = _ffill_inplace(_bucket_means(timestamps_ns, scores, self._freq_ns))
+        self._save_resample_state(timestamps_ns, scores, resampled)
+        return resampled
         
-    def _determine_direction(self, short: float, medium: float, long: float) -> int:
+    def _save_resample_state(self, timestamps_ns: np.ndarray, scores: np.ndarray, resampled: np.ndarray) -> None:
         """
-        Determine the overall trend direction.
+        Remember what the next call needs to extend this resample incrementally.
         
         Args:
-            short: Short-term trend value
-            medium: Medium-term trend value
-            long: Long-term trend value
+            timestamps_ns: Sorted timestamps as int64 nanoseconds
+            scores: Scores aligned with timestamps
+            resampled: Bucket means computed for them
+        """
+        last_bucket = int(timestamps_ns[-1] // self._freq_ns)
+        start = int(np.searchsorted(timestamps_ns, last_bucket * self._freq_ns))
+        self._resample_state = (
+            len(scores), timestamps_ns[-1], scores.sum(), last_bucket,
+            float(scores[start:].sum()), len(scores) - start, resampled[-self._max_window:].copy()
+        )
+        
+    def _signal_from_resampled(self, resampled: np.ndarray,
+                               timestamp: Optional[datetime] = None) -> Optional[TrendSignal]:
+        """
+        Build a trend signal from scores already resampled to update_frequency.
+        
+        Args:
+            resampled: Resampled scores in time order
+            timestamp: Signal time, defaults to now; batches share one
             
         Returns:
-            int: -1 for negative, 0 for neutral, 1 for positive
+            Optional[TrendSignal]: Computed trend signal, None if data is insufficient
         """
-        if short > medium > long:
-            return 1
-        elif short < medium < long:
-            return -1
-        return 0
+        short_term, medium_term, long_term, ok = _tail_means(resampled, *self._windows)
+        if not ok:
+            self.error_handler.log_warning(
+                "Insufficient data for trend analysis: %d points after resampling, need %d without NaN values",
+                len(resampled), self._max_window
+            )
+            return None
+        
+        # Calculate trend strength and direction
+        trend_strength, change_direction = _trend_kernel(short_term, medium_term, long_term)
+        
+        # Create trend signal
+        signal = TrendSignal(
+            timestamp=timestamp or _now(),
+            short_term_trend=short_term,
+            medium_term_trend=medium_term,
+            long_term_trend=long_term,
+            trend_strength=trend_strength,
+            change_direction=change_direction
+        )
+        
+        return signal
+         
+    def _sentiment_arrays(self, sentiment_data: Union[SentimentBatch, List[SentimentResult]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract timestamps and normalized scores as NumPy arrays.
+        
+        Timezone-aware timestamps are expressed in UTC.
+        
+        Args:
+            sentiment_data: Sentiment results, as a batch or a list
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: datetime64[ns] timestamps and float64 scores, in input order
+        """
+        if isinstance(sentiment_data, SentimentBatch):
+            index = pd.DatetimeIndex(sentiment_data.frame['timestamp'])
+            if index.tz is not None:
+                index = index.tz_convert(None)
+            return index.to_numpy(dtype='datetime64[ns]'), sentiment_data.scores()
+            
+        # One vectorized conversion; utc=True also accepts naive and aware mixes
+        timestamps = pd.to_datetime(
+            [sr.timestamp for sr in sentiment_data], utc=True, format='ISO8601', cache=True
+        ).tz_convert(None).to_numpy(dtype='datetime64[ns]')
+        scores = np.fromiter((sr.normalized_score for sr in sentiment_data), dtype=np.float64, count=len(sentiment_data))
+        return timestamps, scores
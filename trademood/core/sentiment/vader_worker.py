@@ -0,0 +1,21 @@
+from typing import Optional
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Kept free of model imports: spawned pool workers import this module alone
+_ANALYZER: Optional[SentimentIntensityAnalyzer] = None
+
+
+def vader_compound(text: str) -> float:
+    """
+    Score a text with VADER inside a worker process.
+    
+    Args:
+        text: Text content to score
+        
+    Returns:
+        float: VADER compound score (-1 to 1)
+    """
+    global _ANALYZER
+    if _ANALYZER is None:
+        _ANALYZER = SentimentIntensityAnalyzer()
+    return _ANALYZER.polarity_scores(text)['compound']
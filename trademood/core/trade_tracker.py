@@ -1,5 +1,6 @@
 import sqlite3
 from datetime import datetime, timezone
+from typing import List
 import pandas as pd
 import yfinance as yf
 import exchange_calendars as xcals
@@ -27,6 +28,8 @@ class TradeTracker:
         Records a new open trade based on a trading signal and entry price.
     record_closed_trade(trade_id, exit_price)
         Records the closure of an existing trade, calculating the P&L.
+    close_trades_batch(trade_ids, exit_price)
+        Closes several open trades at one exit price in a single transaction.
     get_open_trades()
         Retrieves a list of all currently open trades.
     get_closed_trades()
@@ -35,6 +38,26 @@ class TradeTracker:
         Calculates the Profit & Loss for a single trade.
     """
     
+    # Declared column types for trade reads, so pandas skips per-column inference
+    # and the repeated text columns are stored once as categories. Money stays
+    # float64; float32 cannot hold cents on prices above roughly 100k.
+    TRADE_DTYPES = {
+        'trade_id': 'int64',
+        'symbol': 'category',
+        'entry_price': 'float64',
+        'exit_price': 'float64',
+        'quantity': 'float64',
+        'direction': 'category',
+        'status': 'category',
+        'pnl': 'float64',
+        'pnl_pct': 'float64',
+        'stop_loss': 'float64',
+        'take_profit': 'float64',
+        'sentiment_score': 'float64',
+        'signal_confidence': 'float64',
+        'strategy': 'category'
+    }
+    
     def __init__(self, db_handler, error_handler):
         self.db_handler = db_handler
         self.error_handler = error_handler
@@ -81,6 +104,17 @@ class TradeTracker:
             )
             """)
             
+            # Charts read one symbol and interval in time order
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_symbol_interval_ts
+            ON price_data(symbol, interval, timestamp DESC)
+            """)
+            # Latest-close lookups filter on symbol alone
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_symbol_ts
+            ON price_data(symbol, timestamp DESC)
+            """)
+            
             conn.commit()
 
     def record_trade(self, symbol: str, entry_price: float, quantity: float, 
@@ -109,8 +143,9 @@ class TradeTracker:
         try:
             with sqlite3.connect(self.db_handler.db_path) as conn:
                 trade = pd.read_sql(
-                    f"SELECT * FROM trades WHERE trade_id = {trade_id} AND status = 'OPEN'",
-                    conn
+                    "SELECT * FROM trades WHERE trade_id = ? AND status = 'OPEN'",
+                    conn,
+                    params=(int(trade_id),)
                 )
                 if trade.empty:
                     self.error_handler.log_warning(f"Trade {trade_id} not found or already closed")
@@ -138,7 +173,7 @@ class TradeTracker:
                     datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
                     pnl,
                     pnl_pct,
-                    trade_id
+                    int(trade_id)
                 ))
                 conn.commit()
                 
@@ -148,6 +183,53 @@ class TradeTracker:
             self.error_handler.log_error(e, f"closing trade {trade_id}")
             raise
     
+    def close_trades_batch(self, trade_ids: List[int], exit_price: float) -> int:
+        """
+        Close several open trades at the same exit price in one transaction.
+        
+        P&L is computed in SQL per trade direction, so the whole batch is one
+        UPDATE and one commit instead of a read, write and commit per trade.
+        
+        Args:
+            trade_ids: IDs of the trades to close
+            exit_price: Price at which every trade exits
+            
+        Returns:
+            int: Number of trades closed; IDs that are unknown or already closed are skipped
+        """
+        if not trade_ids:
+            return 0
+        ids = [int(trade_id) for trade_id in trade_ids]
+        try:
+            with sqlite3.connect(self.db_handler.db_path) as conn:
+                cursor = conn.execute(f"""
+                UPDATE trades 
+                SET status = 'CLOSED', exit_price = :exit_price, exit_time = :exit_time,
+                    pnl = CASE WHEN direction = 'LONG'
+                               THEN (:exit_price - entry_price) * quantity
+                               ELSE (entry_price - :exit_price) * quantity END,
+                    pnl_pct = CASE WHEN entry_price * quantity != 0
+                                   THEN (CASE WHEN direction = 'LONG'
+                                              THEN :exit_price - entry_price
+                                              ELSE entry_price - :exit_price END) / entry_price * 100
+                                   ELSE 0 END
+                WHERE status = 'OPEN' AND trade_id IN ({", ".join(f":id{i}" for i in range(len(ids)))})
+                """, {
+                    "exit_price": exit_price,
+                    "exit_time": datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                    **{f"id{i}": trade_id for i, trade_id in enumerate(ids)}
+                })
+                closed = cursor.rowcount
+                
+            if closed < len(ids):
+                self.error_handler.log_warning(f"{len(ids) - closed} of {len(ids)} trades not found or already closed")
+            self.error_handler.log_info(f"Closed {closed} trades at ${exit_price:,.2f}")
+            return closed
+            
+        except Exception as e:
+            self.error_handler.log_error(e, f"closing trades {ids}")
+            raise
+    
     def update_price_data(self, symbol: str, interval: str = "5m"):
         """Fetch and store latest price data."""
         try:
@@ -203,8 +285,9 @@ class TradeTracker:
             
             with sqlite3.connect(self.db_handler.db_path) as conn:
                 existing_timestamps = pd.read_sql(
-                    f"SELECT timestamp FROM price_data WHERE symbol = '{symbol}' AND interval = '{interval}'",
-                    conn
+                    "SELECT timestamp FROM price_data WHERE symbol = ? AND interval = ?",
+                    conn,
+                    params=(symbol, interval)
                 )['timestamp'].tolist()
                 
                 data = data[~data['timestamp'].isin(existing_timestamps)]
@@ -232,22 +315,27 @@ class TradeTracker:
         with sqlite3.connect(self.db_handler.db_path) as conn:
             return pd.read_sql(
                 "SELECT * FROM trades WHERE status = 'OPEN' ORDER BY entry_time DESC",
-                conn
+                conn,
+                dtype=self.TRADE_DTYPES
             )
 
     def get_closed_trades(self, limit: int = 20):
         """Get recent closed trades."""
         with sqlite3.connect(self.db_handler.db_path) as conn:
             return pd.read_sql(
-                f"SELECT * FROM trades WHERE status = 'CLOSED' ORDER BY exit_time DESC LIMIT {limit}",
-                conn
+                "SELECT * FROM trades WHERE status = 'CLOSED' ORDER BY exit_time DESC LIMIT ?",
+                conn,
+                params=(int(limit),),
+                dtype=self.TRADE_DTYPES
             )
 
     def get_trade_history(self, symbol: str = None):
         """Get complete trade history."""
         query = "SELECT * FROM trades ORDER BY entry_time DESC"
+        params = ()
         if symbol:
-            query = f"SELECT * FROM trades WHERE symbol = '{symbol}' ORDER BY entry_time DESC"
+            query = "SELECT * FROM trades WHERE symbol = ? ORDER BY entry_time DESC"
+            params = (symbol,)
             
         with sqlite3.connect(self.db_handler.db_path) as conn:
-            return pd.read_sql(query, conn)
+            return pd.read_sql(query, conn, params=params, dtype=self.TRADE_DTYPES)
@@ -1,10 +1,13 @@
+import hashlib
 import sqlite3
-from typing import Optional
+import time
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import numpy as np
 import pandas as pd
 import streamlit as st
 import yfinance as yf
 import plotly.graph_objects as go
-from streamlit_autorefresh import st_autorefresh
 import exchange_calendars as xcals
 from trademood.core.sentiment.fetcher import Fetcher
 from trademood.core.sentiment.analyzer import Analyzer
@@ -12,6 +15,441 @@ from trademood.core.sentiment.pipeline import Pipeline
 from trademood.core.sentiment.trend_generator import TrendGenerator
 from trademood.core.sentiment.signal_generator import SignalGenerator
 from trademood.core.trade_tracker import TradeTracker
+from trademood.dashboard.downsample import lttb_indices
+
+
+def _parse_timestamps(df: pd.DataFrame, fmt: str = 'ISO8601') -> pd.DataFrame:
+    """
+    Convert a frame's 'timestamp' strings to naive UTC datetimes, in place.
+    
+    Plotly then serializes the column as dates instead of shipping strings
+    for the browser to parse point by point.
+    
+    Args:
+        df: Frame with a 'timestamp' column as read from SQLite
+        fmt: strptime format of the stored strings, or 'ISO8601'
+        
+    Returns:
+        pd.DataFrame: df with a datetime64 'timestamp' column
+    """
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format=fmt, utc=True, cache=True).dt.tz_convert(None)
+    return df
+
+
+def _epoch_ms(times) -> np.ndarray:
+    """
+    Convert timestamps to float epoch milliseconds for a date axis.
+    
+    Plotly ships float arrays to the browser as base64 typed arrays, while
+    datetimes and int64 values go out as JSON text; float64 holds
+    millisecond epochs exactly.
+    
+    Args:
+        times: datetime64 Series or array of naive UTC timestamps
+        
+    Returns:
+        np.ndarray: float64 milliseconds since the epoch
+    """
+    return np.asarray(times, dtype='datetime64[ms]').astype(np.int64).astype(np.float64)
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Hash a frame's values, so unchanged query results can be recognized across reruns.
+    
+    Args:
+        df: Frame to fingerprint
+        
+    Returns:
+        str: 16-character hex digest of the row hashes
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=8).hexdigest()
+
+
+def _pnl_colors(values: pd.Series) -> np.ndarray:
+    """
+    Color a P&L column in one pass: green for gains, red for losses, gray otherwise.
+    
+    Args:
+        values: P&L values; missing values count as flat
+        
+    Returns:
+        np.ndarray: CSS declaration per value, for `Styler.apply`
+    """
+    values = values.to_numpy(dtype=np.float64, na_value=0.0)
+    return np.where(values > 0, 'color: green', np.where(values < 0, 'color: red', 'color: gray'))
+
+
+def _downsample(df: pd.DataFrame, value_column: str) -> pd.DataFrame:
+    """
+    Reduce a time-ordered frame to the rows LTTB keeps for plotting.
+    
+    Args:
+        df: Frame with a datetime64 'timestamp' column, ordered by time
+        value_column: Column whose shape the kept rows must preserve
+        
+    Returns:
+        pd.DataFrame: The selected rows, or df itself when it is already small
+    """
+    times = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+    kept = lttb_indices(times.view('i8'), df[value_column].to_numpy(dtype=float))
+    return df if len(kept) == len(df) else df.iloc[kept]
+
+
+@st.cache_resource(show_spinner=False)
+def _ro_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Open one shared read-only connection per database for the dashboard's queries.
+    
+    Autocommit mode keeps each SELECT in its own implicit transaction, so reads
+    always see the pipeline's latest commits instead of a long-lived snapshot.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        sqlite3.Connection: Connection reused across reruns and sessions
+    """
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False, isolation_level=None)
+
+
+def _table_version(conn: sqlite3.Connection, table: str) -> Tuple[int, int]:
+    """
+    Cheap fingerprint of a table's contents, used as a cache key.
+    
+    `MAX(rowid)` is answered from the end of the rowid b-tree, and
+    `PRAGMA data_version` moves whenever any other connection commits, which
+    catches deletes and updates without scanning the table.
+    
+    Args:
+        conn: Open SQLite connection
+        table: Name of one of the application's own tables
+        
+    Returns:
+        Tuple[int, int]: Highest rowid and the connection's data version
+    """
+    max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0]
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    return max_rowid or 0, data_version
+
+
+# Panels with live numbers refresh on their own at this interval; the charts
+# refresh every minute since an unchanged chart is redrawn from session state
+LIVE_REFRESH_INTERVAL = "5min"
+
+
+# CME sessions are defined in New York time
+_NEW_YORK = ZoneInfo("America/New_York")
+
+
+# History shown per update frequency, as SQLite date modifiers; the
+# shortest still spans a weekend market close
+CHART_LOOKBACK = {
+    "5m": "-3 days",
+    "15m": "-5 days",
+    "1h": "-30 days",
+    "4h": "-90 days",
+    "1d": "-2 years",
+}
+
+
+# Page styles, built once at import; Streamlit needs them re-emitted on every rerun
+_CUSTOM_CSS = """
+<style>
+    .stButton>button {
+        background-color: #4CAF50;
+        color: white;
+        border-radius: 5px;
+        padding: 8px 16px;
+        border: none;
+    }
+    .stButton>button:hover {
+        background-color: #45a049;
+    }
+    .metric-card {
+        background-color: #1f2a44;
+        padding: 15px;
+        border-radius: 10px;
+        text-align: center;
+    }
+    .metric-card h3 {
+        margin: 0;
+        font-size: 1.1em;
+        color: #b0b7c3;
+    }
+    .metric-card p {
+        margin: 5px 0 0;
+        font-size: 1.5em;
+        color: #ffffff;
+    }
+    [data-testid="stExpander"] > div:first-child > div[data-testid="stExpanderToggle"] p {
+        font-size: 20px !important;
+        font-weight: bold !important;
+    }
+    [data-testid="stExpander"] > div:first-child > div[data-testid="stExpanderToggle"] span {
+        font-size: 20px !important;
+        font-weight: bold !important;
+    }
+    .stExpander .css-xxxxxx-header-text { /* Replace xxxxxx with the actual class */
+        font-size: 20px !important;
+        font-weight: bold !important;
+    }
+    .stExpander div[data-testid^="stExpanderToggle"] > * {
+        font-size: 20px !important;
+        font-weight: bold !important;
+    }
+    /* Close Selected button */
+    button[key="close_selected_trades"] {
+        background-color: #F44336 !important;
+        color: white !important;
+    }
+</style>
+"""
+
+
+# Open-positions table: read-only trade fields plus a selection column
+OPEN_TRADE_COLUMNS = [
+    'trade_id', 'symbol', 'entry_time', 'entry_price',
+    'quantity', 'direction', 'pnl', 'pnl_pct'
+]
+OPEN_TRADE_COLUMN_CONFIG = {
+    '_selected': st.column_config.CheckboxColumn("Close", width="small"),
+    'trade_id': st.column_config.NumberColumn("ID", format="%d"),
+    'symbol': "Symbol",
+    'entry_time': "Entry Time",
+    'entry_price': st.column_config.NumberColumn("Entry Price", format="$%.2f"),
+    'quantity': st.column_config.NumberColumn("Quantity", format="%.2f"),
+    'direction': "Direction",
+    'pnl': st.column_config.NumberColumn("P&L", format="$%.2f"),
+    'pnl_pct': st.column_config.NumberColumn("P&L %", format="%.2f%%"),
+}
+
+
+# Closed-trades display formats, applied per column by the Styler
+CLOSED_TRADE_FORMATS = {
+    'entry_price': "${:,.2f}",
+    'exit_price': "${:,.2f}",
+    'quantity': "{:,.2f}",
+    'pnl': "${:,.2f}",
+    'pnl_pct': "{:.2f}%",
+}
+
+
+# Layout shared by the sentiment and price charts
+_CHART_LAYOUT = {
+    "height": 400,
+    "margin": {"l": 20, "r": 20, "t": 30, "b": 20},
+    "legend": {"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "right", "x": 1},
+    "xaxis_title": "Time",
+    # x values arrive as epoch milliseconds (see _epoch_ms)
+    "xaxis_type": "date",
+    "hovermode": "x unified",
+}
+
+
+# Stored price bars are naive UTC 'YYYY-MM-DD HH:MM:SS' strings, which numpy parses directly
+PRICE_BAR_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[s]'),
+    ('open', 'f4'),
+    ('high', 'f4'),
+    ('low', 'f4'),
+    ('close', 'f4'),
+])
+
+
+# Chart queries re-run only when their table version changes (or after the TTL).
+# Windows end at the newest stored row rather than now, so a paused pipeline
+# still shows its last stretch of data instead of an empty chart.
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_sentiment_series(db_path: str, symbol: str, lookback: str, version: Tuple[int, int]) -> pd.DataFrame:
+    """Load a symbol's recent sentiment scores, downsampled for plotting."""
+    conn = _ro_conn(db_path)
+    df = pd.read_sql("""
+    SELECT timestamp, normalized_score 
+    FROM sentiment_cache 
+    WHERE symbol = :symbol
+    AND timestamp >= (
+        SELECT strftime('%Y-%m-%dT%H:%M:%S', MAX(timestamp), :lookback)
+        FROM sentiment_cache WHERE symbol = :symbol
+    )
+    ORDER BY timestamp
+    """, conn, params={"symbol": symbol, "lookback": lookback})
+    return _downsample(_parse_timestamps(df), 'normalized_score')
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_trend_series(db_path: str, lookback: str, version: Tuple[int, int]) -> pd.DataFrame:
+    """Load recent stored trend signals, downsampled for plotting."""
+    conn = _ro_conn(db_path)
+    df = pd.read_sql("""
+    SELECT timestamp, short_term_trend, medium_term_trend, long_term_trend
+    FROM trend_signals
+    WHERE timestamp >= (SELECT datetime(MAX(timestamp), ?) FROM trend_signals)
+    ORDER BY timestamp
+    """, conn, params=(lookback,))
+    return _downsample(_parse_timestamps(df), 'short_term_trend')
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_price_series(db_path: str, symbol: str, interval: str, version: Tuple[int, int]) -> np.ndarray:
+    """Load recent OHLC bars for a symbol and interval as a float32 record array."""
+    conn = _ro_conn(db_path)
+    rows = conn.execute("""
+    SELECT timestamp, open, high, low, close
+    FROM price_data
+    WHERE symbol = :symbol AND interval = :interval
+    AND timestamp >= (
+        SELECT datetime(MAX(timestamp), :lookback)
+        FROM price_data WHERE symbol = :symbol AND interval = :interval
+    )
+    ORDER BY timestamp
+    """, {"symbol": symbol, "interval": interval, "lookback": CHART_LOOKBACK[interval]}).fetchall()
+    # Bars feed the candlestick directly; float32 halves the payload sent to the browser
+    return np.array(rows, dtype=PRICE_BAR_DTYPE)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_source_sentiment_series(db_path: str, symbol: str, lookback: str, version: Tuple[int, int]) -> pd.DataFrame:
+    """Load recent scores from sources naming the symbol, downsampled for the price overlay."""
+    conn = _ro_conn(db_path)
+    df = pd.read_sql("""
+    SELECT timestamp, normalized_score
+    FROM sentiment_cache
+    WHERE source LIKE '%' || :symbol || '%'
+    AND timestamp >= (
+        SELECT strftime('%Y-%m-%dT%H:%M:%S', MAX(timestamp), :lookback)
+        FROM sentiment_cache WHERE source LIKE '%' || :symbol || '%'
+    )
+    ORDER BY timestamp
+    """, conn, params={"symbol": symbol, "lookback": lookback})
+    return _downsample(_parse_timestamps(df), 'normalized_score')
+
+
+# Trade tables change only through this dashboard's own actions, which clear these
+@st.cache_data(ttl=15, show_spinner=False)
+def _open_trades(_tracker: TradeTracker, db_path: str) -> pd.DataFrame:
+    """Load open trades through the tracker; db_path keys the cache."""
+    return _tracker.get_open_trades()
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _closed_trades(_tracker: TradeTracker, db_path: str) -> pd.DataFrame:
+    """Load recent closed trades through the tracker; db_path keys the cache."""
+    return _tracker.get_closed_trades()
+
+
+def _clear_trade_caches() -> None:
+    """Drop cached trade lists after a trade is entered or closed."""
+    _open_trades.clear()
+    _closed_trades.clear()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _recent_sentiment(db_path: str, symbol: str, minute: int) -> Tuple[Optional[float], int]:
+    """
+    Average and count a symbol's sentiment scores from the past hour.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        symbol: Symbol to aggregate
+        minute: Current epoch minute; keys the cache so the scan runs at most once a minute
+        
+    Returns:
+        Tuple[Optional[float], int]: Mean normalized score (None if no rows) and row count
+    """
+    # Stored timestamps are ISO strings with a 'T' separator, so the cutoff must be too
+    return _ro_conn(db_path).execute("""
+    SELECT AVG(normalized_score), COUNT(*)
+    FROM sentiment_cache
+    WHERE symbol = ?
+    AND timestamp >= strftime('%Y-%m-%dT%H:%M:%S', 'now', '-1 hour')
+    """, (symbol,)).fetchone()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _list_tables(db_path: str) -> List[str]:
+    """
+    List the tables in the database; the schema rarely changes, so it is cached.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        List[str]: Table names in sqlite_master order
+    """
+    rows = _ro_conn(db_path).execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+    return [name for (name,) in rows]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_exit_price(symbol: str, db_path: str) -> Optional[float]:
+    """
+    Look up the latest stored close for a symbol, used as the exit price.
+    
+    Args:
+        symbol: Symbol whose trades are being closed
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        Optional[float]: Most recent close, or None if the symbol has no bars
+    """
+    row = _ro_conn(db_path).execute("""
+    SELECT close FROM price_data 
+    WHERE symbol = ? 
+    ORDER BY timestamp DESC LIMIT 1
+    """, (symbol,)).fetchone()
+    return None if row is None else row[0]
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _yf_latest_close(symbol: str) -> Optional[Tuple[float, str]]:
+    """
+    Fetch the latest 5-minute close from Yahoo Finance, shared by every panel.
+    
+    Used only when the database has no price for the symbol; caching keeps the
+    metrics, trade controls and exit-price fallbacks to one download a minute.
+    
+    Args:
+        symbol: Ticker to download
+        
+    Returns:
+        Optional[Tuple[float, str]]: Close and its 'YYYY-MM-DD HH:MM:SS' timestamp,
+            or None if Yahoo returned no bars
+    """
+    price_data = yf.download(symbol, period="1d", interval="5m", prepost=True, auto_adjust=False)
+    if price_data.empty:
+        return None
+    return price_data["Close"].iloc[-1].item(), price_data.index[-1].strftime('%Y-%m-%d %H:%M:%S')
+
+
+@st.cache_resource(show_spinner=False)
+def _cme_calendar() -> xcals.ExchangeCalendar:
+    """Build the CME calendar once per process; construction parses years of sessions."""
+    return xcals.get_calendar("CME")
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _is_cme_open(minute: int) -> bool:
+    """
+    Check whether the CME is trading, evaluated at most once per minute.
+    
+    Args:
+        minute: Epoch minute to check; keys the cache so the calendar lookup runs once a minute
+        
+    Returns:
+        bool: True if the minute falls inside an open CME session
+    """
+    calendar = _cme_calendar()
+    now = pd.Timestamp(minute * 60, unit='s', tz='UTC').tz_convert(_NEW_YORK)
+    return calendar.is_session(now.date()) and calendar.is_open_at_time(now)
+
+
+def _cme_open_now() -> bool:
+    """Return whether the CME is open at the current minute."""
+    # A plain epoch minute keys the cache; no timezone-aware clock read per call
+    return _is_cme_open(int(time.time()) // 60)
+
 
 class App:
     """
@@ -65,78 +503,7 @@ class App:
 
     def _apply_custom_styles(self):
         """Apply custom CSS styles."""
-        st.markdown("""
-        <style>
-            .stButton>button {
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 5px;
-                padding: 8px 16px;
-                border: none;
-            }
-            .stButton>button:hover {
-                background-color: #45a049;
-            }
-            .metric-card {
-                background-color: #1f2a44;
-                padding: 15px;
-                border-radius: 10px;
-                text-align: center;
-            }
-            .metric-card h3 {
-                margin: 0;
-                font-size: 1.1em;
-                color: #b0b7c3;
-            }
-            .metric-card p {
-                margin: 5px 0 0;
-                font-size: 1.5em;
-                color: #ffffff;
-            }
-            /* Constrain table row height */
-            .trade-row {
-                line-height: 24px !important;
-                height: 28px !important;
-                margin: 0 !important;
-                padding: 0 !important;
-                display: flex;
-                align-items: center;
-            }
-            .trade-row .stColumn {
-                padding: 2px !important;
-            }
-            /* Style checkboxes */
-            .stCheckbox {
-                display: flex !important;
-                align-items: center !important;
-                justify-content: center !important;
-            }
-            .stCheckbox label {
-                margin: 0 !important;
-            }
-            [data-testid="stExpander"] > div:first-child > div[data-testid="stExpanderToggle"] p {
-                font-size: 20px !important;
-                font-weight: bold !important;
-            }
-            [data-testid="stExpander"] > div:first-child > div[data-testid="stExpanderToggle"] span {
-                font-size: 20px !important;
-                font-weight: bold !important;
-            }
-            .stExpander .css-xxxxxx-header-text { /* Replace xxxxxx with the actual class */
-                font-size: 20px !important;
-                font-weight: bold !important;
-            }
-            .stExpander div[data-testid^="stExpanderToggle"] > * {
-                font-size: 20px !important;
-                font-weight: bold !important;
-            }
-            /* Close Selected button */
-            button[key="close_selected_trades"] {
-                background-color: #F44336 !important;
-                color: white !important;
-            }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
     
     def show(self):
         """Display the complete dashboard."""
@@ -146,9 +513,6 @@ class App:
         if 'update_frequency' not in st.session_state:
             st.session_state.update_frequency = "5m"
         
-        # Auto-refresh every 5 minutes
-        st_autorefresh(interval=5*60*1000, key="auto_refresh")
-        
         # Header
         st.title("📈 Market Sentiment Trading Dashboard")
         st.markdown("---")
@@ -249,44 +613,40 @@ class App:
            
     def _clear_sentiment_cache_for_symbol(self, symbol: str):
         """Clear sentiment cache for a specific symbol."""
-        try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM sentiment_cache WHERE symbol = ?", (symbol,))
-                conn.commit()
-                self.error_handler.log_info(f"Cleared sentiment cache for {symbol}")
-        except Exception as e:
-            self.error_handler.log_error(e, f"clearing sentiment cache for {symbol}")
+        removed = self.db_handler.clear_sentiment_cache(symbol)
+        self.error_handler.log_info(f"Cleared {removed} cached sentiment results for {symbol}")
                      
+    @st.fragment(run_every="1min")
     def _show_sentiment_trend(self):
         """Display interactive sentiment trend chart."""
         st.header("Sentiment Trend Analysis")
         
         try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                # Get sentiment data
-                sentiment_df = pd.read_sql("""
-                SELECT timestamp, normalized_score 
-                FROM sentiment_cache 
-                WHERE symbol = ?
-                ORDER BY timestamp
-                """, conn, params=(self.symbol,)) 
-                
-                # Get trend signals
-                trend_df = pd.read_sql("""
-                SELECT timestamp, short_term_trend, medium_term_trend, long_term_trend
-                FROM trend_signals
-                ORDER BY timestamp
-                """, conn)
+            db_path = self.db_handler.db_path
+            conn = _ro_conn(db_path)
+            sentiment_version = _table_version(conn, "sentiment_cache")
+            trend_version = _table_version(conn, "trend_signals")
+            
+            # Nothing new since the last render: redraw the figure already built
+            chart_key = (self.symbol, self.update_frequency, sentiment_version, trend_version)
+            cached = st.session_state.get("sentiment_chart")
+            if cached is not None and cached[0] == chart_key:
+                st.plotly_chart(cached[1], use_container_width=True)
+                return
+            
+            # Downsampled series, re-queried only when the tables change
+            lookback = CHART_LOOKBACK[self.update_frequency]
+            sentiment_df = _fetch_sentiment_series(db_path, self.symbol, lookback, sentiment_version)
+            trend_df = _fetch_trend_series(db_path, lookback, trend_version)
                 
             if not sentiment_df.empty:
                 # Create figure
                 fig = go.Figure()
                 
                 # Add sentiment line
-                fig.add_trace(go.Scatter(
-                    x=sentiment_df['timestamp'],
-                    y=sentiment_df['normalized_score'],
+                fig.add_trace(go.Scattergl(
+                    x=_epoch_ms(sentiment_df['timestamp']),
+                    y=sentiment_df['normalized_score'].to_numpy(dtype=np.float32),
                     name="Sentiment Score",
                     line=dict(color='#4285F4', width=2),
                     mode='lines'
@@ -294,43 +654,35 @@ class App:
                 
                 # Add trend signals if available
                 if not trend_df.empty:
-                    fig.add_trace(go.Scatter(
-                        x=trend_df['timestamp'],
-                        y=trend_df['short_term_trend'],
+                    trend_ms = _epoch_ms(trend_df['timestamp'])
+                    fig.add_trace(go.Scattergl(
+                        x=trend_ms,
+                        y=trend_df['short_term_trend'].to_numpy(dtype=np.float32),
                         name="Short-Term Trend",
-                        line=dict(color='#FBBC05', width=1.5, dash='dot')
+                        line=dict(color='#FBBC05', width=1.5, dash='dot'),
+                        mode='lines'
                     ))
                     
-                    fig.add_trace(go.Scatter(
-                        x=trend_df['timestamp'],
-                        y=trend_df['medium_term_trend'],
+                    fig.add_trace(go.Scattergl(
+                        x=trend_ms,
+                        y=trend_df['medium_term_trend'].to_numpy(dtype=np.float32),
                         name="Medium-Term Trend",
-                        line=dict(color='#FF6D00', width=1.5, dash='dash')
+                        line=dict(color='#FF6D00', width=1.5, dash='dash'),
+                        mode='lines'
                     ))
                     
-                    fig.add_trace(go.Scatter(
-                        x=trend_df['timestamp'],
-                        y=trend_df['long_term_trend'],
+                    fig.add_trace(go.Scattergl(
+                        x=trend_ms,
+                        y=trend_df['long_term_trend'].to_numpy(dtype=np.float32),
                         name="Long-Term Trend",
-                        line=dict(color='#34A853', width=1.5, dash='dot')
+                        line=dict(color='#34A853', width=1.5, dash='dot'),
+                        mode='lines'
                     ))
                 
                 # Update layout
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=20, r=20, t=30, b=20),
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    xaxis_title="Time",
-                    yaxis_title="Sentiment Score",
-                    hovermode="x unified"
-                )
+                fig.update_layout(**_CHART_LAYOUT, yaxis_title="Sentiment Score", yaxis_hoverformat=".3f")
                 
+                st.session_state.sentiment_chart = (chart_key, fig)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("No sentiment data available for the selected symbol")
@@ -339,77 +691,71 @@ class App:
             st.error(f"Error loading sentiment data: {str(e)}")
             self.error_handler.log_error(e, "displaying sentiment trend")
         
+    @st.fragment(run_every="1min")
     def _show_price_chart(self):
         """Display interactive price chart with sentiment overlay."""
         st.header("Price Action with Sentiment")
         
         try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                # Get price data
-                price_df = pd.read_sql(f"""
-                SELECT timestamp, open, high, low, close
-                FROM price_data
-                WHERE symbol = '{self.symbol}' AND interval = '{self.update_frequency}'
-                ORDER BY timestamp
-                """, conn)
-                
-                # Get sentiment data aligned with price timestamps
-                sentiment_df = pd.read_sql(f"""
-                SELECT timestamp, normalized_score
-                FROM sentiment_cache
-                WHERE source LIKE '%' || '{self.symbol}' || '%'
-                ORDER BY timestamp
-                """, conn)
+            db_path = self.db_handler.db_path
+            conn = _ro_conn(db_path)
+            price_version = _table_version(conn, "price_data")
+            sentiment_version = _table_version(conn, "sentiment_cache")
+            
+            chart_key = (self.symbol, self.update_frequency, price_version, sentiment_version)
+            cached = st.session_state.get("price_chart")
+            if cached is not None and cached[0] == chart_key:
+                st.plotly_chart(cached[1], use_container_width=True)
+                return
+            
+            bars = _fetch_price_series(db_path, self.symbol, self.update_frequency, price_version)
+            sentiment_df = _fetch_source_sentiment_series(
+                db_path, self.symbol, CHART_LOOKBACK[self.update_frequency], sentiment_version
+            )
                 
-            if not price_df.empty:
+            if len(bars):
                 # Create candlestick chart
                 fig = go.Figure()
                 
                 # Add candlesticks
                 fig.add_trace(go.Candlestick(
-                    x=price_df['timestamp'],
-                    open=price_df['open'],
-                    high=price_df['high'],
-                    low=price_df['low'],
-                    close=price_df['close'],
+                    x=_epoch_ms(bars['timestamp']),
+                    open=bars['open'],
+                    high=bars['high'],
+                    low=bars['low'],
+                    close=bars['close'],
                     name="Price",
                     increasing_line_color='#34A853',
                     decreasing_line_color='#EA4335'
                 ))
                 
-                # Add sentiment as bar chart on secondary y-axis
+                # Add sentiment as a WebGL line on secondary y-axis
                 if not sentiment_df.empty:
-                    fig.add_trace(go.Bar(
-                        x=sentiment_df['timestamp'],
-                        y=sentiment_df['normalized_score'],
+                    fig.add_trace(go.Scattergl(
+                        x=_epoch_ms(sentiment_df['timestamp']),
+                        y=sentiment_df['normalized_score'].to_numpy(dtype=np.float32),
                         name="Sentiment",
-                        marker_color='#4285F4',
+                        mode='lines',
+                        line=dict(color='#4285F4', width=1),
                         opacity=0.5,
                         yaxis="y2"
                     ))
                 
                 # Update layout
                 fig.update_layout(
-                    height=400,
-                    margin=dict(l=20, r=20, t=30, b=20),
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="right",
-                        x=1
-                    ),
-                    xaxis_title="Time",
+                    **_CHART_LAYOUT,
                     yaxis_title="Price",
+                    yaxis_hoverformat=",.2f",
                     yaxis2=dict(
                         title="Sentiment",
                         overlaying="y",
                         side="right",
-                        range=[-1, 1]
-                    ),
-                    hovermode="x unified"
+                        range=[-1, 1],
+                        hoverformat=".3f"
+                    )
                 )
                 
+                st.session_state.price_chart = (chart_key, fig)
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("No price data available for the selected symbol")
@@ -418,81 +764,64 @@ class App:
             st.error(f"Error loading price data: {str(e)}")
             self.error_handler.log_error(e, "displaying price chart")
 
+    @st.fragment(run_every=LIVE_REFRESH_INTERVAL)
     def _show_key_metrics(self):
         """Display key trading metrics."""
         st.header("Performance Metrics")
         
         try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                # Check price_data table contents
-                price_debug = pd.read_sql(
-                    f"SELECT * FROM price_data WHERE symbol = '{self.symbol}' LIMIT 5",
-                    conn
-                )
-                if price_debug.empty:
-                    self.error_handler.log_info(f"Debug: No rows in price_data for {self.symbol}")
-                else:
-                    self.error_handler.log_info(f"Debug: Found {len(price_debug)} rows in price_data for {self.symbol}")
-                
-                # Check trades table contents
-                trades_debug = pd.read_sql("SELECT * FROM trades LIMIT 5", conn)
-                if trades_debug.empty:
-                    self.error_handler.log_info("Debug: No rows in trades table")
-                else:
-                    self.error_handler.log_info(f"Debug: Found {len(trades_debug)} rows in trades table")
-                
-                # Get trade stats
-                stats = pd.read_sql("""
-                SELECT 
-                    COUNT(*) as total_trades,
-                    SUM(CASE WHEN status = 'OPEN' THEN 1 ELSE 0 END) as open_trades,
-                    SUM(CASE WHEN status = 'CLOSED' THEN 1 ELSE 0 END) as closed_trades,
-                    SUM(CASE WHEN status = 'CLOSED' AND pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
-                    SUM(CASE WHEN status = 'CLOSED' AND pnl <= 0 THEN 1 ELSE 0 END) as losing_trades,
-                    AVG(CASE WHEN status = 'CLOSED' THEN pnl_pct END) as avg_pnl_pct,
-                    SUM(CASE WHEN status = 'CLOSED' THEN pnl END) as total_pnl
-                FROM trades
-                """, conn).iloc[0]
-                
-                # Log stats content
-                self.error_handler.log_info(f"Debug: Trade stats - {stats.to_dict()}")
-                
-                # Handle None values
-                closed_trades = stats['closed_trades'] or 0
-                winning_trades = stats['winning_trades'] or 0
-                total_pnl = stats['total_pnl'] or 0
-                avg_pnl_pct = stats['avg_pnl_pct'] or 0
-                
-                # Get current price from database
-                price_df = pd.read_sql(f"""
-                SELECT close FROM price_data 
-                WHERE symbol = '{self.symbol}' 
-                ORDER BY timestamp DESC LIMIT 1
-                """, conn)
-                
-                current_price = None
-                if not price_df.empty:
-                    current_price = price_df.iloc[0, 0]
-                else:
-                    self.error_handler.log_warning(f"No price data found in database for {self.symbol}")
-                    # Fallback: Fetch from Yahoo Finance using yf.download
-                    try:
-                        price_data = yf.download(
-                            self.symbol,
-                            period="5d",  
-                            interval="5m",
-                            prepost=True,
-                            auto_adjust=False
-                        )
-                        if not price_data.empty:
-                            current_price = price_data["Close"].iloc[-1].item() 
-                            self.error_handler.log_info(f"Fetched current price for {self.symbol} from Yahoo Finance: {current_price}")
-                            # Update price_data table
-                            self.trade_tracker.update_price_data(self.symbol, self.update_frequency)
-                        else:
-                            self.error_handler.log_warning(f"No price data available from Yahoo Finance for {self.symbol}")
-                    except Exception as e:
-                        self.error_handler.log_error(e, f"fetching price from Yahoo Finance for {self.symbol}")
+            cursor = _ro_conn(self.db_handler.db_path).cursor()
+            cursor.row_factory = sqlite3.Row
+            # Table checks, trade stats and the latest close in one round trip
+            stats = cursor.execute("""
+            SELECT 
+                (SELECT COUNT(*) FROM (SELECT 1 FROM price_data WHERE symbol = :symbol LIMIT 5)) as price_rows,
+                (SELECT COUNT(*) FROM (SELECT 1 FROM trades LIMIT 5)) as trade_rows,
+                COUNT(*) as total_trades,
+                SUM(CASE WHEN status = 'OPEN' THEN 1 ELSE 0 END) as open_trades,
+                SUM(CASE WHEN status = 'CLOSED' THEN 1 ELSE 0 END) as closed_trades,
+                SUM(CASE WHEN status = 'CLOSED' AND pnl > 0 THEN 1 ELSE 0 END) as winning_trades,
+                SUM(CASE WHEN status = 'CLOSED' AND pnl <= 0 THEN 1 ELSE 0 END) as losing_trades,
+                AVG(CASE WHEN status = 'CLOSED' THEN pnl_pct END) as avg_pnl_pct,
+                SUM(CASE WHEN status = 'CLOSED' THEN pnl END) as total_pnl,
+                (SELECT close FROM price_data WHERE symbol = :symbol
+                 ORDER BY timestamp DESC LIMIT 1) as latest_close
+            FROM trades
+            """, {"symbol": self.symbol}).fetchone()
+            
+            if stats['price_rows'] == 0:
+                self.error_handler.log_info(f"Debug: No rows in price_data for {self.symbol}")
+            else:
+                self.error_handler.log_info(f"Debug: Found {stats['price_rows']} rows in price_data for {self.symbol}")
+            if stats['trade_rows'] == 0:
+                self.error_handler.log_info("Debug: No rows in trades table")
+            else:
+                self.error_handler.log_info(f"Debug: Found {stats['trade_rows']} rows in trades table")
+            
+            # Log stats content
+            self.error_handler.log_info(f"Debug: Trade stats - {dict(stats)}")
+            
+            # Handle None values
+            closed_trades = stats['closed_trades'] or 0
+            winning_trades = stats['winning_trades'] or 0
+            total_pnl = stats['total_pnl'] or 0
+            avg_pnl_pct = stats['avg_pnl_pct'] or 0
+            
+            current_price = stats['latest_close']
+            if current_price is None:
+                self.error_handler.log_warning(f"No price data found in database for {self.symbol}")
+                # Fallback: latest close from Yahoo Finance
+                try:
+                    latest = _yf_latest_close(self.symbol)
+                    if latest is not None:
+                        current_price = latest[0]
+                        self.error_handler.log_info(f"Fetched current price for {self.symbol} from Yahoo Finance: {current_price}")
+                        # Update price_data table
+                        self.trade_tracker.update_price_data(self.symbol, self.update_frequency)
+                    else:
+                        self.error_handler.log_warning(f"No price data available from Yahoo Finance for {self.symbol}")
+                except Exception as e:
+                    self.error_handler.log_error(e, f"fetching price from Yahoo Finance for {self.symbol}")
             
             # Display metrics
             col1, col2 = st.columns(2)
@@ -515,41 +844,36 @@ class App:
             st.error(f"Error loading metrics: {str(e)}")
             self.error_handler.log_error(e, "displaying key metrics")
                     
+    @st.fragment(run_every=LIVE_REFRESH_INTERVAL)
     def _show_sentiment_stats(self):
         """Display current sentiment statistics."""
         st.header("Current Sentiment")
         
         try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                # Get latest sentiment
-                sentiment = pd.read_sql("""
-                SELECT 
-                    AVG(normalized_score) as avg_score,
-                    COUNT(*) as count
-                FROM sentiment_cache
-                WHERE symbol = ?
-                AND timestamp >= datetime('now', '-1 hour')
-                """, conn, params=(self.symbol,)).iloc[0]
-                
-                # Get latest signal
-                signal = pd.read_sql("""
-                SELECT signal, confidence 
-                FROM trading_signals 
-                WHERE symbol = ?
-                ORDER BY timestamp DESC 
-                LIMIT 1
-                """, conn, params=(self.symbol,))
-                
+            conn = _ro_conn(self.db_handler.db_path)
+            # Get latest sentiment
+            avg_score, count = _recent_sentiment(self.db_handler.db_path, self.symbol, int(time.time() // 60))
+            
+            # Get latest signal
+            signal = conn.execute("""
+            SELECT signal, confidence 
+            FROM trading_signals 
+            WHERE symbol = ?
+            ORDER BY timestamp DESC 
+            LIMIT 1
+            """, (self.symbol,)).fetchone()
+            
             # Display sentiment
-            st.metric("Average Score", f"{sentiment['avg_score']:.2f}" if sentiment['count'] > 0 else "N/A")
-            st.metric("Recent Signals", sentiment['count'])
+            st.metric("Average Score", f"{avg_score:.2f}" if count > 0 else "N/A")
+            st.metric("Recent Signals", count)
             
-            if not signal.empty:
-                color = "green" if signal.iloc[0]['signal'] == "BUY" else "red" if signal.iloc[0]['signal'] == "SELL" else "gray"
+            if signal is not None:
+                last_signal, confidence = signal
+                color = "green" if last_signal == "BUY" else "red" if last_signal == "SELL" else "gray"
                 st.markdown(f"""
                 <div style="border-left: 4px solid {color}; padding: 0.5rem;">
-                    <strong>Last Signal:</strong> {signal.iloc[0]['signal']}<br>
-                    <strong>Confidence:</strong> {signal.iloc[0]['confidence']:.2f}
+                    <strong>Last Signal:</strong> {last_signal}<br>
+                    <strong>Confidence:</strong> {confidence:.2f}
                 </div>
                 """, unsafe_allow_html=True)
                 
@@ -560,38 +884,27 @@ class App:
     def _show_trade_controls(self):
         """Display trade entry controls."""
         # Check if COMEX market is open
-        comex = xcals.get_calendar("CME")
-        now = pd.Timestamp.now(tz="America/New_York")
-        market_open = comex.is_session(now.date()) and comex.is_open_at_time(now)
+        market_open = _cme_open_now()
         
         # Get most recent price from database
         recent_price = None
         price_timestamp = None
-        with sqlite3.connect(self.db_handler.db_path) as conn:
-            query = f"""
-            SELECT close, timestamp FROM price_data 
-            WHERE symbol = '{self.symbol}' 
-            ORDER BY timestamp DESC LIMIT 1
-            """
-            result = pd.read_sql(query, conn)
-            if not result.empty:
-                recent_price = result.iloc[0]['close']
-                price_timestamp = result.iloc[0]['timestamp']
-                self.error_handler.log_info(f"Retrieved recent price for {self.symbol}: ${recent_price:,.2f} at {price_timestamp}")
+        conn = _ro_conn(self.db_handler.db_path)
+        result = conn.execute("""
+        SELECT close, timestamp FROM price_data 
+        WHERE symbol = ? 
+        ORDER BY timestamp DESC LIMIT 1
+        """, (self.symbol,)).fetchone()
+        if result is not None:
+            recent_price, price_timestamp = result
+            self.error_handler.log_info(f"Retrieved recent price for {self.symbol}: ${recent_price:,.2f} at {price_timestamp}")
         
         # If market is open and no price in DB, try fetching from yfinance
         if market_open and recent_price is None:
             try:
-                price_data = yf.download(
-                    self.symbol,
-                    period="5d",
-                    interval="5m",
-                    prepost=True,
-                    auto_adjust=False
-                )
-                if not price_data.empty:
-                    recent_price = price_data["Close"].iloc[-1].item()
-                    price_timestamp = price_data.index[-1].strftime('%Y-%m-%d %H:%M:%S')
+                latest = _yf_latest_close(self.symbol)
+                if latest is not None:
+                    recent_price, price_timestamp = latest
                     self.error_handler.log_info(f"Fetched current price for {self.symbol} from Yahoo Finance: ${recent_price:,.2f}")
                     self.trade_tracker.update_price_data(self.symbol, self.update_frequency)
                 else:
@@ -632,13 +945,13 @@ class App:
                         
                         # Get latest signal confidence
                         confidence = 0.5
-                        with sqlite3.connect(self.db_handler.db_path) as conn:
-                            result = pd.read_sql("""
-                            SELECT confidence FROM trading_signals 
-                            ORDER BY timestamp DESC LIMIT 1
-                            """, conn)
-                            if not result.empty:
-                                confidence = result.iloc[0, 0]
+                        conn = _ro_conn(self.db_handler.db_path)
+                        result = conn.execute("""
+                        SELECT confidence FROM trading_signals 
+                        ORDER BY timestamp DESC LIMIT 1
+                        """).fetchone()
+                        if result is not None:
+                            confidence = result[0]
                         
                         # Record trade
                         trade_id = self.trade_tracker.record_trade(
@@ -651,6 +964,7 @@ class App:
                             stop_loss=sl_price,
                             take_profit=tp_price
                         )
+                        _clear_trade_caches()
                         
                         st.success(f"Trade #{trade_id} entered successfully!")
                         self.error_handler.log_info(f"New trade entered: {trade_id}")
@@ -663,36 +977,29 @@ class App:
 
     @st.fragment
     def _show_trade_history(self):
-        """Display trade history table with checkbox-based close functionality."""
+        """Display trade history with an open-positions editor for selecting trades to close."""
         st.header("Trade History")
         
         try:
-            # Clear cache for trade data
-            st.cache_data.clear()
-            
             # Get open and closed trades
-            open_trades = self.trade_tracker.get_open_trades()
-            closed_trades = self.trade_tracker.get_closed_trades()
+            open_trades = _open_trades(self.trade_tracker, self.db_handler.db_path)
+            closed_trades = _closed_trades(self.trade_tracker, self.db_handler.db_path)
             
             # Initialize session state
             if 'selected_trades' not in st.session_state:
-                st.session_state.selected_trades = []
-            if 'show_confirmation' not in st.session_state:
-                st.session_state.show_confirmation = False
+                st.session_state.selected_trades = set()
+            if 'trade_editor_generation' not in st.session_state:
+                st.session_state.trade_editor_generation = 0
             
             # Log session state for debugging
-            self.error_handler.log_info(f"Session state: selected_trades={st.session_state.selected_trades}, "
-                                    f"show_confirmation={st.session_state.show_confirmation}")
+            self.error_handler.log_info(f"Session state: selected_trades={st.session_state.selected_trades}")
             
             # Show open trades
             if not open_trades.empty:
                 st.subheader("Open Positions")
                 
                 # Ensure selected_trades only contains valid trade IDs
-                st.session_state.selected_trades = [
-                    trade_id for trade_id in st.session_state.selected_trades
-                    if trade_id in open_trades['trade_id'].values
-                ]
+                st.session_state.selected_trades &= set(open_trades['trade_id'].tolist())
                 
                 # Close Selected Positions button (always active)
                 if st.button("Close Selected Positions", key="close_selected_trades"):
@@ -700,102 +1007,32 @@ class App:
                         st.error("Please select at least one trade to close.")
                         self.error_handler.log_info("Close Selected Positions clicked with no trades selected")
                     else:
-                        st.session_state.show_confirmation = True
                         self.error_handler.log_info(f"Close Selected Positions clicked with {len(st.session_state.selected_trades)} trades selected")
+                        self._confirm_close_dialog(sorted(st.session_state.selected_trades))
                 
-                # Confirmation dialog
-                with st.container():
-                    if st.session_state.show_confirmation:
-                        st.warning(
-                            f"Are you sure you want to close {len(st.session_state.selected_trades)} "
-                            f"selected position{'s' if len(st.session_state.selected_trades) > 1 else ''}? "
-                            f"This action cannot be undone."
-                        )
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.button("Confirm Close", key="confirm_close"):
-                                try:
-                                    exit_price = self._get_exit_price()
-                                    if exit_price is None:
-                                        st.error("Could not determine current price for closing trades.")
-                                        self.error_handler.log_warning("No valid exit price for closing trades")
-                                    else:
-                                        for trade_id in st.session_state.selected_trades.copy():
-                                            self.trade_tracker.close_trade(trade_id, exit_price)
-                                        st.success(
-                                            f"Closed {len(st.session_state.selected_trades)} selected "
-                                            f"position{'s' if len(st.session_state.selected_trades) > 1 else ''} successfully!"
-                                        )
-                                        self.error_handler.log_info(
-                                            f"Closed {len(st.session_state.selected_trades)} selected trades"
-                                        )
-                                        st.session_state.selected_trades = []
-                                        st.session_state.show_confirmation = False
-                                        st.rerun()  # Full rerun for closures
-                                except Exception as e:
-                                    st.error(f"Error closing selected trades: {str(e)}")
-                                    self.error_handler.log_error(e, "closing selected trades")
-                                    st.session_state.show_confirmation = False
-                                    st.rerun()
-                        
-                        with col2:
-                            if st.button("Cancel", key="cancel_close"):
-                                st.session_state.show_confirmation = False
-                                st.session_state.selected_trades = []  # Clear selections
-                                self.error_handler.log_info("Close confirmation cancelled")
-                                st.rerun()  # Rerun to hide dialog
-                
-                # Display table
-                st.markdown('<div class="trade-row">', unsafe_allow_html=True)
-                cols = st.columns([0.5, 1, 1, 2, 1, 1, 1, 1, 1])
-                headers = ['', 'ID', 'Symbol', 'Entry Time', 'Entry Price', 'Quantity', 'Direction', 'P&L', 'P&L %']
-                
-                # Select All checkbox
-                select_all = cols[0].checkbox(
-                    "",
-                    key="select_all",
-                    value=len(st.session_state.selected_trades) == len(open_trades) and len(open_trades) > 0,
-                    label_visibility="collapsed"
+                # Display table: one editor whose only editable column is the selection,
+                # rebuilt only when the open trades themselves change
+                fingerprint = _frame_fingerprint(open_trades)
+                prepared = st.session_state.get("open_trades_table")
+                if prepared is None or prepared[0] != fingerprint:
+                    table = open_trades.sort_values('entry_time', ascending=False)[OPEN_TRADE_COLUMNS]
+                    table.insert(0, '_selected', False)
+                    prepared = st.session_state.open_trades_table = (fingerprint, table)
+                table = prepared[1]
+                # Keyed on the trade set so a selection never carries over to shifted rows
+                editor_key = (
+                    f"open_trades_editor_{st.session_state.trade_editor_generation}_"
+                    f"{hash(tuple(table['trade_id']))}"
                 )
-                if select_all and len(st.session_state.selected_trades) != len(open_trades):
-                    st.session_state.selected_trades = open_trades['trade_id'].tolist()
-                    self.error_handler.log_info("Selected all trades")
-                elif not select_all and len(st.session_state.selected_trades) > 0:
-                    st.session_state.selected_trades = []
-                    self.error_handler.log_info("Deselected all trades")
-                
-                for col, header in zip(cols[1:], headers[1:]):
-                    col.write(f'<b>{header}</b>', unsafe_allow_html=True)
-                
-                for idx, row in open_trades.sort_values('entry_time', ascending=False).iterrows():
-                    trade_id = row['trade_id']
-                    st.markdown('<div class="trade-row">', unsafe_allow_html=True)
-                    cols = st.columns([0.5, 1, 1, 2, 1, 1, 1, 1, 1])
-                    
-                    # Checkbox for individual trade
-                    is_checked = cols[0].checkbox(
-                        "",
-                        key=f"select_{trade_id}",
-                        value=trade_id in st.session_state.selected_trades,
-                        label_visibility="collapsed"
-                    )
-                    if is_checked and trade_id not in st.session_state.selected_trades:
-                        st.session_state.selected_trades.append(trade_id)
-                        self.error_handler.log_info(f"Selected trade {trade_id}")
-                    elif not is_checked and trade_id in st.session_state.selected_trades:
-                        st.session_state.selected_trades.remove(trade_id)
-                        self.error_handler.log_info(f"Deselected trade {trade_id}")
-                    
-                    cols[1].write(row['trade_id'])
-                    cols[2].write(row['symbol'])
-                    cols[3].write(row['entry_time'])
-                    cols[4].write(f"${row['entry_price']:,.2f}")
-                    cols[5].write(f"{row['quantity']:,.2f}")
-                    cols[6].write(row['direction'])
-                    cols[7].write(f"${row['pnl']:,.2f}" if pd.notnull(row['pnl']) else "N/A")
-                    cols[8].write(f"{row['pnl_pct']:.2f}%" if pd.notnull(row['pnl_pct']) else "N/A")
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
+                edited = st.data_editor(
+                    table,
+                    key=editor_key,
+                    column_config=OPEN_TRADE_COLUMN_CONFIG,
+                    disabled=OPEN_TRADE_COLUMNS,
+                    hide_index=True,
+                    use_container_width=True
+                )
+                st.session_state.selected_trades = set(edited.loc[edited['_selected'], 'trade_id'].tolist())
                 
             else:
                 st.info("No open positions available.")
@@ -808,12 +1045,10 @@ class App:
                     'entry_price', 'exit_price', 'quantity', 'direction', 
                     'pnl', 'pnl_pct'
                 ]
-                def color_pnl(val):
-                    color = 'green' if val > 0 else 'red' if val < 0 else 'gray'
-                    return f'color: {color}'
-                
                 st.dataframe(
-                    closed_trades[display_cols].style.map(color_pnl, subset=['pnl', 'pnl_pct']),
+                    closed_trades[display_cols].style
+                        .format(CLOSED_TRADE_FORMATS, na_rep="N/A")
+                        .apply(_pnl_colors, subset=['pnl', 'pnl_pct']),
                     height=min(300, 50 + 35 * len(closed_trades)),
                     use_container_width=True
                 )
@@ -825,36 +1060,63 @@ class App:
             st.error(f"Error loading trade history: {str(e)}")
             self.error_handler.log_error(e, "displaying trade history")
                            
+    @st.dialog("Confirm Close")
+    def _confirm_close_dialog(self, trade_ids: List[int]):
+        """
+        Ask for confirmation in a modal, then close the selected trades at the current price.
+        
+        Args:
+            trade_ids: IDs of the open trades to close
+        """
+        plural = 's' if len(trade_ids) > 1 else ''
+        st.warning(
+            f"Are you sure you want to close {len(trade_ids)} selected position{plural}? "
+            f"This action cannot be undone."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Confirm Close", key="confirm_close"):
+                try:
+                    exit_price = self._get_exit_price()
+                    if exit_price is None:
+                        st.error("Could not determine current price for closing trades.")
+                        self.error_handler.log_warning("No valid exit price for closing trades")
+                        return
+                    self.trade_tracker.close_trades_batch(trade_ids, exit_price)
+                    _clear_trade_caches()
+                    _fetch_exit_price.clear()
+                    st.toast(f"Closed {len(trade_ids)} selected position{plural} successfully!")
+                    self.error_handler.log_info(f"Closed {len(trade_ids)} selected trades")
+                except Exception as e:
+                    _clear_trade_caches()
+                    st.error(f"Error closing selected trades: {str(e)}")
+                    self.error_handler.log_error(e, "closing selected trades")
+                    return
+                st.session_state.selected_trades = set()
+                st.session_state.trade_editor_generation += 1
+                st.rerun()  # Closes the dialog and redraws the page without the closed trades
+        
+        with col2:
+            if st.button("Cancel", key="cancel_close"):
+                st.session_state.selected_trades = set()  # Clear selections
+                st.session_state.trade_editor_generation += 1
+                self.error_handler.log_info("Close confirmation cancelled")
+                st.rerun()  # Closes the dialog
+
     def _get_exit_price(self) -> Optional[float]:
         """Fetch the current or most recent price for closing trades."""
         try:
-            comex = xcals.get_calendar("CME")
-            now = pd.Timestamp.now(tz="America/New_York")
-            market_open = comex.is_session(now.date()) and comex.is_open_at_time(now)
-            
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                query = f"""
-                SELECT close FROM price_data 
-                WHERE symbol = '{self.symbol}' 
-                ORDER BY timestamp DESC LIMIT 1
-                """
-                result = pd.read_sql(query, conn)
-                if not result.empty:
-                    exit_price = result.iloc[0]['close']
-                    self.error_handler.log_info(f"Using database price for {self.symbol}: ${exit_price:,.2f}")
-                    return exit_price
-            
-            if market_open:
+            exit_price = _fetch_exit_price(self.symbol, self.db_handler.db_path)
+            if exit_price is not None:
+                self.error_handler.log_info(f"Using database price for {self.symbol}: ${exit_price:,.2f}")
+                return exit_price
+            
+            # The calendar only matters when falling back to a live quote
+            if _cme_open_now():
                 try:
-                    price_data = yf.download(
-                        self.symbol,
-                        period="5d",
-                        interval="5m",
-                        prepost=True,
-                        auto_adjust=False
-                    )
-                    if not price_data.empty:
-                        exit_price = price_data["Close"].iloc[-1].item()
+                    latest = _yf_latest_close(self.symbol)
+                    if latest is not None:
+                        exit_price = latest[0]
                         self.error_handler.log_info(f"Fetched current price for {self.symbol} from Yahoo Finance: ${exit_price:,.2f}")
                         self.trade_tracker.update_price_data(self.symbol, self.update_frequency)
                         return exit_price
@@ -872,32 +1134,33 @@ class App:
     def _show_debug_info(self):
         """Show debug information."""
         try:
-            with sqlite3.connect(self.db_handler.db_path) as conn:
-                tables = pd.read_sql("SELECT name FROM sqlite_master WHERE type='table'", conn)
-                # st.write("Database Tables:", tables['name'].tolist())
-                
-                # Initialize session state for selected table
-                if 'debug_table' not in st.session_state:
-                    st.session_state.debug_table = tables['name'].iloc[0] if not tables.empty else None
-                
-                selected_table = st.selectbox(
-                    "Select Table to View Contents",
-                    tables['name'],
-                    index=tables['name'].tolist().index(st.session_state.debug_table) if st.session_state.debug_table in tables['name'].tolist() else 0
-                )
-                
-                # Update session state
-                if selected_table != st.session_state.debug_table:
-                    st.session_state.debug_table = selected_table
-                
-                if selected_table:
-                    table_data = pd.read_sql(f"SELECT * FROM {selected_table}", conn)
-                    st.write(f"Contents of {selected_table}:")
-                    st.dataframe(table_data, use_container_width=True)
+            conn = _ro_conn(self.db_handler.db_path)
+            if st.button("Refresh schema", key="refresh_schema"):
+                _list_tables.clear()
+            tables = _list_tables(self.db_handler.db_path)
+            
+            # Initialize session state for selected table
+            if 'debug_table' not in st.session_state:
+                st.session_state.debug_table = tables[0] if tables else None
+            
+            selected_table = st.selectbox(
+                "Select Table to View Contents",
+                tables,
+                index=tables.index(st.session_state.debug_table) if st.session_state.debug_table in tables else 0
+            )
+            
+            # Update session state
+            if selected_table != st.session_state.debug_table:
+                st.session_state.debug_table = selected_table
+            
+            # Identifiers cannot be bound, so only names read from sqlite_master are interpolated
+            if selected_table and selected_table in tables:
+                preview_rows = st.number_input("Preview rows", min_value=1, max_value=10000, value=100, step=50)
+                table_data = pd.read_sql(f'SELECT * FROM "{selected_table}" LIMIT ?', conn, params=(int(preview_rows),))
+                count = conn.execute(f'SELECT COUNT(*) FROM "{selected_table}"').fetchone()[0]
+                st.write(f"Contents of {selected_table} ({len(table_data)} of {count} rows):")
+                st.dataframe(table_data, use_container_width=True)
                     
-                    count = len(table_data)
-                    st.write(f"Row count in {selected_table}: {count}")
-                        
         except Exception as e:
             st.error(f"Debug error: {str(e)}")
             self.error_handler.log_error(e, "displaying debug info")
@@ -0,0 +1,56 @@
+import numpy as np
+
+# Points kept per chart trace; roughly the pixel width of a wide chart
+MAX_CHART_POINTS = 3000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int = MAX_CHART_POINTS) -> np.ndarray:
+    """
+    Select the points of a series to plot with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into `n_out - 2` buckets, and from each bucket the point forming
+    the largest triangle with the previously kept point and the average of
+    the next bucket is chosen, so peaks and troughs survive the reduction.
+
+    Args:
+        x: Sorted numeric x values (e.g. int64 nanosecond timestamps)
+        y: Values aligned with x
+        n_out: Number of points to keep
+
+    Returns:
+        np.ndarray: Indices of the kept points in ascending order; every index
+            when the series already has at most n_out points
+    """
+    size = len(x)
+    if n_out >= size or n_out < 3:
+        return np.arange(size)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, size - 1, n_out - 1).astype(np.intp)
+    starts, stops = edges[:-1], edges[1:]
+
+    # Average of each bucket's successor; the last bucket's successor is the final point
+    counts = np.diff(np.append(edges, size))
+    next_x = (np.add.reduceat(x, edges) / counts)[1:]
+    next_y = (np.add.reduceat(y, edges) / counts)[1:]
+
+    # Buckets as rows of a matrix, short rows padded by repeating their last point
+    # (a repeat never wins argmax over its first occurrence)
+    width = int((stops - starts).max())
+    rows = np.minimum(starts[:, None] + np.arange(width), stops[:, None] - 1)
+    bucket_x, bucket_y = x[rows], y[rows]
+
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        ax, ay = x[previous], y[previous]
+        areas = np.abs(
+            (ax - next_x[bucket]) * (bucket_y[bucket] - ay)
+            - (ax - bucket_x[bucket]) * (next_y[bucket] - ay)
+        )
+        previous = rows[bucket, areas.argmax()]
+        kept[bucket + 1] = previous
+    return kept
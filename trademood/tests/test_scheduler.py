@@ -1,11 +1,71 @@
-import time
+import unittest
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
 from apscheduler.schedulers.background import BackgroundScheduler
-scheduler = BackgroundScheduler()
-
-def test_job(): print("Test job ran")
-scheduler.add_job(test_job, 'interval', seconds=10)
-scheduler.start()
-try:
-    while True: time.sleep(60)
-except KeyboardInterrupt:
-    scheduler.shutdown()
\ No newline at end of file
+from apscheduler.triggers.interval import IntervalTrigger
+from trademood.core.sentiment.pipeline import Pipeline, CACHE_PURGE_INTERVAL
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    A class containing unit tests for the APScheduler setup used by the pipeline.
+
+    The tests either compute fire times directly from triggers or run a
+    scheduler only until a single short-lived job has fired, so none of them
+    block or depend on wall-clock intervals.
+
+    Methods
+    -------
+    test_interval_trigger_fire_times()
+        Tests interval trigger fire times without starting a scheduler.
+    test_background_job_runs()
+        Tests that a background scheduler runs a one-off job and shuts down.
+    test_pipeline_purges_expired_cache()
+        Tests that scheduled pipeline runs include a periodic expired-cache purge.
+    """
+
+    def test_interval_trigger_fire_times(self):
+        """Test interval trigger fire times without starting a scheduler."""
+        start = datetime(2025, 6, 16, 9, 0, tzinfo=timezone.utc)
+        trigger = IntervalTrigger(minutes=5, start_date=start, timezone=timezone.utc)
+
+        first = trigger.get_next_fire_time(None, start)
+        self.assertEqual(first, start)
+        second = trigger.get_next_fire_time(first, first + timedelta(seconds=1))
+        self.assertEqual(second, start + timedelta(minutes=5))
+
+    def test_background_job_runs(self):
+        """Test that a background scheduler runs a one-off job and shuts down."""
+        ran = threading.Event()
+        scheduler = BackgroundScheduler(timezone=timezone.utc)
+        scheduler.add_job(ran.set, 'date', run_date=datetime.now(timezone.utc) + timedelta(milliseconds=50))
+        scheduler.start()
+        try:
+            self.assertTrue(ran.wait(timeout=5), "Scheduled job did not run")
+        finally:
+            scheduler.shutdown(wait=False)
+        self.assertFalse(scheduler.running)
+
+    def test_pipeline_purges_expired_cache(self):
+        """Test that scheduled pipeline runs include a periodic expired-cache purge."""
+        scheduler = MagicMock()
+        analyzer = MagicMock()
+        analyzer.db_handler.remove_expired.return_value = 3
+        pipeline = Pipeline(MagicMock(), analyzer, MagicMock(), MagicMock(),
+                            error_handler=MagicMock(), update_frequency="5m", scheduler=scheduler)
+        pipeline.start_scheduled_runs()
+        
+        purge_jobs = [call for call in scheduler.add_job.call_args_list
+                      if call.args[0] == pipeline._purge_expired_sentiment]
+        self.assertEqual(len(purge_jobs), 1)
+        trigger = purge_jobs[0].args[1]
+        self.assertIsInstance(trigger, IntervalTrigger)
+        self.assertEqual(trigger.interval, timedelta(minutes=CACHE_PURGE_INTERVAL))
+        
+        purge_jobs[0].args[0]()
+        analyzer.db_handler.remove_expired.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
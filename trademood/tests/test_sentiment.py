@@ -1,20 +1,33 @@
 import unittest
+import gc
+import io
 import os
+import time
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import weakref
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+import numpy as np
 import pandas as pd
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from requests.exceptions import RequestException
+from urllib3.response import HTTPResponse
 from trademood.core.error_handler import ErrorHandler
 from trademood.core.database_handler import DatabaseHandler
+from trademood.core.trade_tracker import TradeTracker
 from trademood.core.sentiment.fetcher import Fetcher
 from trademood.core.sentiment.analyzer import Analyzer
 from trademood.core.sentiment.trend_generator import TrendGenerator
 from trademood.core.sentiment.signal_generator import SignalGenerator
 from trademood.core.models.sentiment_result import SentimentResult
+from trademood.core.models.sentiment_batch import SentimentBatch
 from trademood.core.models.trend_signal import TrendSignal
 from trademood.core.models.trading_signal import TradingSignal
 
+# Suppress TensorFlow warnings before any model library initializes
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
 
 class TestSentiment(unittest.TestCase):
     """
@@ -26,27 +39,58 @@ class TestSentiment(unittest.TestCase):
 
     Methods
     -------
+    setUpClass()
+        Loads the sentiment models once for the whole test class.
     setUp()
         Sets up the testing environment, initializing database and components.
     tearDown()
         Cleans up the testing environment after each test.
     test_database_connection()
         Tests the successful connection to the database.
+    test_handler_released()
+        Tests that an unused handler is collected and its connections closed.
     test_fetcher_rss()
         Tests RSS feed fetching from mock sources.
+    test_fetcher_throttled()
+        Tests that a throttled feed is logged once without waiting out Retry-After.
     test_analyzer()
         Tests sentiment analysis and caching.
+    test_analyzer_close()
+        Tests that closing the analyzer shuts down its VADER worker pool.
     test_trend_signal_generation()
         Tests the logic for generating trend signals.
     test_trading_signal_logic()
         Tests the conditions and outputs of the trading signal generator.
+    test_remove_expired()
+        Tests TTL-based eviction of cached sentiment results.
+    test_cache_sentiment_results()
+        Tests caching a batch of sentiment results in one call.
+    test_cache_sees_other_writers()
+        Tests that cache lookups see rows another handler deletes or adds.
+    test_cache_ignores_own_and_unrelated_writes()
+        Tests that the handler's own commits and trade writes keep the key set and probe LRU.
+    test_trend_signal_from_batch()
+        Tests that columnar batches produce the same trend signal as lists.
+    test_trend_signals_batch()
+        Tests that multi-symbol trend generation matches per-symbol generation.
+    test_trend_signal_from_arrays()
+        Tests trend generation from cached sentiment history read as arrays.
+    test_close_trades_batch()
+        Tests closing several trades at one exit price in a single call.
     """
     
+    @classmethod
+    def setUpClass(cls):
+        """Load the sentiment models once; each test rebinds the analyzer to its own database."""
+        model_db_path = "test_sentiment_models.db"
+        model_db_handler = DatabaseHandler(model_db_path, ErrorHandler())
+        cls.shared_analyzer = Analyzer(error_handler=ErrorHandler(), db_handler=model_db_handler)
+        model_db_handler.close_connection()
+        if os.path.exists(model_db_path):
+            os.remove(model_db_path)
+    
     def setUp(self):
         """Set up test fixtures."""
-        # Suppress TensorFlow warnings
-        os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-        
         self.error_handler = ErrorHandler()
         # Use temporary database file
         self.db_path = "test_sentiment.db"
@@ -79,10 +123,9 @@ class TestSentiment(unittest.TestCase):
             db_handler=self.db_handler
         )
         
-        self.analyzer = Analyzer(
-            error_handler=self.error_handler,
-            db_handler=self.db_handler
-        )
+        self.analyzer = self.shared_analyzer
+        self.analyzer.error_handler = self.error_handler
+        self.analyzer.db_handler = self.db_handler
         
         self.trend_generator = TrendGenerator(
             error_handler=self.error_handler,
@@ -97,6 +140,8 @@ class TestSentiment(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures."""
+        # Close pooled connections so SQLite checkpoints and drops WAL files
+        self.db_handler.close_connection()
         # Remove temporary database file
         if os.path.exists(self.db_path):
             os.remove(self.db_path)
@@ -113,6 +158,17 @@ class TestSentiment(unittest.TestCase):
         except sqlite3.Error as e:
             self.fail(f"Database connection failed: {str(e)}")
 
+    def test_handler_released(self):
+        """Test that an unused handler is collected and its connections closed."""
+        handler = DatabaseHandler(self.db_path, self.error_handler)
+        conn = handler.connect()
+        handler_ref = weakref.ref(handler)
+        del handler
+        gc.collect()
+        self.assertIsNone(handler_ref())
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
     def test_fetcher_rss(self):
         """Test RSS feed fetching."""
         try:
@@ -127,10 +183,32 @@ class TestSentiment(unittest.TestCase):
         except RequestException as e:
             self.skipTest(f"Network error during RSS fetch: {str(e)}")
 
+    def test_fetcher_throttled(self):
+        """Test that a throttled feed is logged once without waiting out Retry-After."""
+        requests_made = []
+        
+        def throttled(pool, conn, method, url, **kwargs):
+            requests_made.append(url)
+            return HTTPResponse(body=io.BytesIO(b""), headers={"Retry-After": "120"}, status=429,
+                                preload_content=False, request_method=method, request_url=url)
+        
+        started = time.monotonic()
+        with patch('urllib3.connectionpool.HTTPConnectionPool._make_request', throttled):
+            entries = self.fetcher._fetch_rss_feed("http://throttled.example.com/rss")
+        self.assertEqual(entries, [])
+        self.assertEqual(len(requests_made), 1)
+        self.assertLess(time.monotonic() - started, 5)
+
     def test_analyzer(self):
         """Test sentiment analysis."""
         test_text = "The market is showing strong growth potential despite some volatility."
-        result = self.analyzer.analyze_text(test_text, "test_source", "GC=F")
+        # A miss is scored once, without a second bulk cache probe
+        with patch.object(self.db_handler, 'get_cached_sentiments_bulk') as bulk_probe, \
+                patch.object(self.analyzer, 'analyze_vader_batch',
+                             wraps=self.analyzer.analyze_vader_batch) as vader:
+            result = self.analyzer.analyze_text(test_text, "test_source", "GC=F")
+        bulk_probe.assert_not_called()
+        vader.assert_called_once()
         
         self.assertIsInstance(result, SentimentResult)
         self.assertGreaterEqual(result.normalized_score, -1.0)
@@ -143,26 +221,45 @@ class TestSentiment(unittest.TestCase):
         self.assertEqual(cached.normalized_score, result.normalized_score)
         self.assertEqual(cached.source, "test_source")
         self.assertEqual(cached.text, test_text)
+        
+        # A repeat analysis is served from the in-process cache; the models are not called
+        with patch.object(self.analyzer, 'analyze_vader_batch') as vader, \
+                patch.object(self.analyzer, 'analyze_bert_batch') as bert:
+            self.assertIs(self.analyzer.analyze_text(test_text, "test_source", "GC=F"), cached)
+        vader.assert_not_called()
+        bert.assert_not_called()
+
+    def test_analyzer_close(self):
+        """Test that closing the analyzer shuts down its VADER worker pool."""
+        pool = MagicMock()
+        self.analyzer._vader_pool = pool
+        self.analyzer.close()
+        pool.shutdown.assert_called_once_with(cancel_futures=True)
+        self.assertIsNone(self.analyzer._vader_pool)
+        
+        # Closing again, or with no pool started, is a no-op
+        self.analyzer.close()
+        pool.shutdown.assert_called_once()
 
     def test_trend_signal_generation(self):
         """Test trend signal generation with sufficient mock data."""
         # Create enough data points for the rolling windows
         num_points = max(self.trend_generator.window_sizes.values()) * 2  
+        steps = np.arange(num_points)
         
-        sentiment_results = [
-            SentimentResult(
-                symbol="GC=F",
-                text=f"Market update {i}",
-                source="test_source",
-                timestamp=datetime.now() - timedelta(minutes=15*i),
-                vader_score=0.5 - (i * 0.02),
-                bert_score=0.6 - (i * 0.03),
-                normalized_score=0.55 - (i * 0.025),
-                keywords=["market", "update"]
-            ) for i in range(num_points)
-        ]
+        # Build the batch column-wise, as the pipeline hands it to the trend generator
+        sentiment_batch = SentimentBatch(frame=pd.DataFrame({
+            'symbol': "GC=F",
+            'text': [f"Market update {i}" for i in steps],
+            'source': "test_source",
+            'timestamp': pd.Timestamp.now() - pd.to_timedelta(15 * steps, unit='min'),
+            'vader_score': 0.5 - steps * 0.02,
+            'bert_score': 0.6 - steps * 0.03,
+            'normalized_score': 0.55 - steps * 0.025,
+            'keywords': [["market", "update"]] * num_points
+        }, columns=list(SentimentBatch.COLUMNS)))
         
-        trend_signal = self.trend_generator.generate_trend_signals(sentiment_results)
+        trend_signal = self.trend_generator.generate_trend_signals(sentiment_batch)
         
         self.assertIsNotNone(trend_signal, "Trend signal generation failed")
         self.assertIsInstance(trend_signal, TrendSignal)
@@ -173,6 +270,12 @@ class TestSentiment(unittest.TestCase):
         self.assertGreaterEqual(trend_signal.trend_strength, 0.0)
         self.assertLessEqual(trend_signal.trend_strength, 1.0)
         
+        # Values are plain Python numbers, not NumPy scalars
+        for value in (trend_signal.short_term_trend, trend_signal.medium_term_trend,
+                      trend_signal.long_term_trend, trend_signal.trend_strength):
+            self.assertIs(type(value), float)
+        self.assertIs(type(trend_signal.change_direction), int)
+        
         # Verify direction makes sense given the downward trend in our mock data
         if trend_signal.short_term_trend < trend_signal.medium_term_trend < trend_signal.long_term_trend:
             self.assertEqual(trend_signal.change_direction, -1)
@@ -207,6 +310,224 @@ class TestSentiment(unittest.TestCase):
         self.assertGreaterEqual(trading_signal.confidence, 0.0)
         self.assertLessEqual(trading_signal.confidence, 1.0)
 
+    def test_remove_expired(self):
+        """Test that only sentiment results past their TTL are evicted."""
+        fresh = SentimentResult(
+            symbol="GC=F", text="Fresh headline", source="test_source",
+            timestamp=datetime.now(), vader_score=0.1, bert_score=0.2,
+            normalized_score=0.14, keywords=["fresh"]
+        )
+        stale = SentimentResult(
+            symbol="GC=F", text="Stale headline", source="test_source",
+            timestamp=datetime.now() - timedelta(days=2), vader_score=0.1, bert_score=0.2,
+            normalized_score=0.14, keywords=["stale"]
+        )
+        self.assertTrue(self.db_handler.cache_sentiment_result(fresh))
+        self.assertTrue(self.db_handler.cache_sentiment_result(stale))
+        
+        # Expired rows are never served, even before they are purged
+        self.assertIsNone(self.db_handler.get_cached_sentiment("test_source", "Stale headline"))
+        bulk = self.db_handler.get_cached_sentiments_bulk(
+            [("test_source", "Fresh headline"), ("test_source", "Stale headline")]
+        )
+        self.assertEqual(list(bulk), [("test_source", "Fresh headline")])
+        
+        self.assertEqual(self.db_handler.remove_expired(), 1)
+        self.assertIsNotNone(self.db_handler.get_cached_sentiment("test_source", "Fresh headline"))
+        self.assertIsNone(self.db_handler.get_cached_sentiment("test_source", "Stale headline"))
+
+    def test_cache_sentiment_results(self):
+        """Test caching a batch of sentiment results in one call."""
+        results = [
+            SentimentResult(
+                symbol="GC=F", text=f"Batch headline {i}", source="test_source",
+                timestamp=datetime.now(), vader_score=0.1 * i, bert_score=0.0,
+                normalized_score=0.06 * i, keywords=["batch", "headline"]
+            ) for i in range(5)
+        ]
+        self.assertTrue(self.db_handler.cache_sentiment_results(results))
+        
+        for result in results:
+            cached = self.db_handler.get_cached_sentiment("test_source", result.text)
+            self.assertIsNotNone(cached)
+            self.assertAlmostEqual(cached.normalized_score, result.normalized_score)
+
+    def test_cache_sees_other_writers(self):
+        """Test that cache lookups see rows another handler deletes or adds."""
+        result = SentimentResult(
+            symbol="GC=F", text="Shared headline", source="test_source",
+            timestamp=datetime.now(), vader_score=0.1, bert_score=0.2,
+            normalized_score=0.14, keywords=["shared"]
+        )
+        self.assertTrue(self.db_handler.cache_sentiment_result(result))
+        self.assertIsNotNone(self.db_handler.get_cached_sentiment("test_source", "Shared headline"))
+        
+        # A second handler stands in for another process, such as the dashboard;
+        # external writes are checked on every probe instead of once a second
+        other = DatabaseHandler(self.db_path, self.error_handler)
+        with patch('trademood.core.database_handler.EXTERNAL_WRITE_CHECK_INTERVAL', 0):
+            try:
+                self.assertEqual(other.clear_sentiment_cache("GC=F"), 1)
+                self.assertIsNone(self.db_handler.get_cached_sentiment("test_source", "Shared headline"))
+            
+                added = SentimentResult(
+                    symbol="GC=F", text="Other writer headline", source="test_source",
+                    timestamp=datetime.now(), vader_score=0.3, bert_score=0.4,
+                    normalized_score=0.34, keywords=["other"]
+                )
+                self.assertTrue(other.cache_sentiment_result(added))
+            finally:
+                other.close_connection()
+            self.assertEqual(self.db_handler.get_cached_sentiment("test_source", "Other writer headline"), added)
+            self.assertIn(("test_source", "Other writer headline"),
+                          self.db_handler.get_cached_sentiments_bulk([("test_source", "Other writer headline")]))
+
+    def test_cache_ignores_own_and_unrelated_writes(self):
+        """Test that the handler's own commits and trade writes keep the key set and probe LRU."""
+        result = SentimentResult(
+            symbol="GC=F", text="Threaded headline", source="test_source",
+            timestamp=datetime.now(), vader_score=0.1, bert_score=0.2,
+            normalized_score=0.14, keywords=["threaded"]
+        )
+        self.assertIsNone(self.db_handler.get_cached_sentiment("test_source", "Threaded headline"))
+        self.assertTrue(self.db_handler.cache_sentiment_result(replace(result, text="Remembered headline")))
+        self.assertIsNotNone(self.db_handler.get_cached_sentiment("test_source", "Remembered headline"))
+        
+        # Same handler, different thread and therefore a different reader connection
+        writer = threading.Thread(target=self.db_handler.cache_sentiment_result, args=(result,))
+        writer.start()
+        writer.join()
+        tracker = TradeTracker(self.db_handler, self.error_handler)
+        tracker.record_trade("GC=F", 100.0, 1.0, "LONG", 0.0, 0.5)
+        
+        with patch.object(self.db_handler, '_load_known_keys', wraps=self.db_handler._load_known_keys) as load:
+            self.assertEqual(self.db_handler.get_cached_sentiment("test_source", "Threaded headline"), result)
+            self.assertIn(("test_source", "Threaded headline"),
+                          self.db_handler.get_cached_sentiments_bulk([("test_source", "Threaded headline")]))
+        load.assert_not_called()
+        hits = self.db_handler._probe_cache.cache_info().hits
+        self.assertIsNotNone(self.db_handler.get_cached_sentiment("test_source", "Remembered headline"))
+        self.assertEqual(self.db_handler._probe_cache.cache_info().hits, hits + 1)
+
+    def test_trend_signal_from_batch(self):
+        """Test that columnar batches produce the same trend signal as lists."""
+        num_points = max(self.trend_generator.window_sizes.values()) * 2
+        sentiment_results = [
+            SentimentResult(
+                symbol="GC=F", text=f"Market update {i}", source="test_source",
+                timestamp=datetime.now() - timedelta(minutes=15*i),
+                vader_score=0.5, bert_score=0.6,
+                normalized_score=0.55 - (i * 0.025), keywords=["market", "update"]
+            ) for i in range(num_points)
+        ]
+        batch = SentimentBatch.from_results(sentiment_results)
+        self.assertEqual(len(batch), num_points)
+        self.assertEqual(batch.to_results(), sentiment_results)
+        # Feeds mix UTC offsets, aware datetimes and naive ISO strings; all become naive UTC
+        mixed = SentimentBatch.from_results([
+            replace(sentiment_results[0], timestamp=datetime(2025, 6, 16, 12, 0, tzinfo=timezone.utc)),
+            replace(sentiment_results[1], timestamp=datetime(2025, 6, 16, 8, 30, tzinfo=timezone(timedelta(hours=-4)))),
+            replace(sentiment_results[2], timestamp="2025-06-16T13:00:00"),
+        ])
+        self.assertEqual(list(mixed.timestamps()), [
+            np.datetime64('2025-06-16T12:00'), np.datetime64('2025-06-16T12:30'), np.datetime64('2025-06-16T13:00')
+        ])
+        
+        # Batches compare and hash by identity rather than by their frame
+        self.assertEqual(batch, batch)
+        self.assertNotEqual(batch, SentimentBatch.from_results(sentiment_results))
+        self.assertEqual(len({batch, batch}), 1)
+        
+        from_list = self.trend_generator.generate_trend_signals(sentiment_results)
+        from_batch = self.trend_generator.generate_trend_signals(batch)
+        self.assertIsNotNone(from_batch)
+        self.assertAlmostEqual(from_batch.short_term_trend, from_list.short_term_trend)
+        self.assertAlmostEqual(from_batch.long_term_trend, from_list.long_term_trend)
+        self.assertEqual(from_batch.change_direction, from_list.change_direction)
+
+    def test_trend_signals_batch(self):
+        """Test that multi-symbol trend generation matches per-symbol generation."""
+        num_points = max(self.trend_generator.window_sizes.values()) * 2
+        steps = np.arange(num_points)
+        timestamps = pd.Timestamp.now() - pd.to_timedelta(7 * steps, unit='min')
+        sentiment_by_symbol = {
+            symbol: SentimentBatch(frame=pd.DataFrame({
+                'symbol': symbol,
+                'text': [f"Market update {i}" for i in steps],
+                'source': "test_source",
+                'timestamp': timestamps,
+                'vader_score': 0.5,
+                'bert_score': 0.6,
+                'normalized_score': slope * steps,
+                'keywords': [["market", "update"]] * num_points
+            }, columns=list(SentimentBatch.COLUMNS)))
+            for symbol, slope in (("GC=F", 0.02), ("SI=F", -0.03))
+        }
+        sentiment_by_symbol["CL=F"] = SentimentBatch(frame=sentiment_by_symbol["GC=F"].frame.iloc[:2])
+        
+        signals = self.trend_generator.generate_trend_signals_batch(sentiment_by_symbol)
+        self.assertIsNone(signals["CL=F"])
+        for symbol in ("GC=F", "SI=F"):
+            single = self.trend_generator.generate_trend_signals(sentiment_by_symbol[symbol])
+            self.assertIsNotNone(signals[symbol])
+            self.assertAlmostEqual(signals[symbol].short_term_trend, single.short_term_trend)
+            self.assertAlmostEqual(signals[symbol].long_term_trend, single.long_term_trend)
+            self.assertEqual(signals[symbol].change_direction, single.change_direction)
+
+    def test_trend_signal_from_arrays(self):
+        """Test trend generation from cached sentiment history read as arrays."""
+        num_points = max(self.trend_generator.window_sizes.values()) * 2
+        sentiment_results = [
+            SentimentResult(
+                symbol="GC=F", text=f"Market update {i}", source="test_source",
+                timestamp=datetime.now(timezone.utc) - timedelta(minutes=5*i),
+                vader_score=0.5, bert_score=0.6,
+                normalized_score=0.55 - (i * 0.025), keywords=["market", "update"]
+            ) for i in range(num_points)
+        ]
+        self.assertTrue(self.db_handler.cache_sentiment_results(sentiment_results))
+        
+        timestamps, scores = self.db_handler.get_sentiment_arrays("GC=F")
+        self.assertEqual(timestamps.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(len(scores), num_points)
+        
+        from_arrays = self.trend_generator.generate_trend_signals_from_arrays(timestamps, scores)
+        from_list = self.trend_generator.generate_trend_signals(sentiment_results)
+        self.assertIsNotNone(from_arrays)
+        self.assertAlmostEqual(from_arrays.short_term_trend, from_list.short_term_trend)
+        self.assertAlmostEqual(from_arrays.long_term_trend, from_list.long_term_trend)
+        self.assertEqual(from_arrays.change_direction, from_list.change_direction)
+        
+        # A repeat on unchanged history reuses the trends but is stamped with the current time
+        later = datetime.now() + timedelta(minutes=5)
+        with patch('trademood.core.sentiment.trend_generator._now', return_value=later):
+            repeat = self.trend_generator.generate_trend_signals_from_arrays(timestamps, scores)
+        self.assertEqual(repeat.timestamp, later)
+        self.assertEqual(repeat.short_term_trend, from_arrays.short_term_trend)
+        self.assertEqual(repeat.change_direction, from_arrays.change_direction)
+
+    def test_close_trades_batch(self):
+        """Test closing several trades at one exit price in a single call."""
+        tracker = TradeTracker(self.db_handler, self.error_handler)
+        long_id = tracker.record_trade("GC=F", 100.0, 2.0, "LONG", 0.0, 0.5)
+        short_id = tracker.record_trade("GC=F", 50.0, 1.5, "SHORT", 0.0, 0.5)
+        open_id = tracker.record_trade("GC=F", 80.0, 1.0, "LONG", 0.0, 0.5)
+        
+        # Unknown IDs are skipped and do not count as closed
+        self.assertEqual(tracker.close_trades_batch([long_id, short_id, 9999], 90.0), 2)
+        
+        closed = tracker.get_closed_trades().set_index('trade_id')
+        self.assertAlmostEqual(closed.loc[long_id, 'pnl'], -20.0)
+        self.assertAlmostEqual(closed.loc[long_id, 'pnl_pct'], -10.0)
+        self.assertAlmostEqual(closed.loc[short_id, 'pnl'], -60.0)
+        self.assertAlmostEqual(closed.loc[short_id, 'pnl_pct'], -80.0)
+        self.assertEqual(tracker.get_open_trades()['trade_id'].tolist(), [open_id])
+        self.assertIsInstance(closed['direction'].dtype, pd.CategoricalDtype)
+        self.assertEqual(closed['pnl'].dtype, np.float64)
+        
+        # Already closed trades are left untouched
+        self.assertEqual(tracker.close_trades_batch([long_id], 95.0), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file